@@ -0,0 +1,146 @@
+"""
+Startup benchmark: how long `import usps_address_validator` takes and which
+heavy dependencies it drags in, so regressions in the lazy imports show up.
+
+Each measurement runs in a fresh interpreter. A first, unmeasured run per case
+compiles the bytecode; the rest are timed and summarized (min/median/max), both
+inside the child (the statement alone) and as wall time of the whole process.
+Cases:
+
+    interpreter   python -c pass (the floor every process pays)
+    import        import usps_address_validator
+    core          from usps_address_validator import build_address_params, validate_address
+    cli_help      python usps_address_validator.py --help
+
+Examples:
+
+    uv run python benchmarks/startup.py
+    uv run python benchmarks/startup.py --repeat 20 --max-import-ms 150
+
+Results are written as JSON (default benchmarks/results/startup-<timestamp>.json).
+With --max-import-ms the exit code is 1 when the median `import` statement
+time is over the limit, so the check can run in CI.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+MODULE_PATH = os.path.join(ROOT, "usps_address_validator.py")
+
+# Dependencies that should only load on first use
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl", "requests", "keyring", "tkinter", "asyncio", "httpx", "pyarrow"]
+
+# Runs inside the child: time the statement, report the heavy modules it loaded
+CHILD_TEMPLATE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+IMPORT_CASES = {
+    "interpreter": "pass",
+    "import": "import usps_address_validator",
+    "core": "from usps_address_validator import build_address_params, validate_address",
+}
+
+def child_env():
+    env = dict(os.environ)
+    # Bytecode must be cached, or every run would include compiling the module
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def measure(name):
+    """One run of a case: {"seconds": in-child time or None, "process_seconds": wall time, "loaded": [...]}."""
+    if name == "cli_help":
+        command = [sys.executable, MODULE_PATH, "--help"]
+    else:
+        command = [sys.executable, "-c", CHILD_TEMPLATE.format(statement=IMPORT_CASES[name], heavy=HEAVY_MODULES)]
+    started = time.perf_counter()
+    proc = subprocess.run(command, cwd=ROOT, env=child_env(), capture_output=True, text=True)
+    process_seconds = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup case {name} failed:\n{proc.stderr}")
+    if name == "cli_help":
+        return {"seconds": None, "process_seconds": process_seconds, "loaded": None}
+    return {**json.loads(proc.stdout.strip().splitlines()[-1]), "process_seconds": process_seconds}
+
+def summarize(values):
+    ms = [value * 1000 for value in values]
+    return {"min": round(min(ms), 2), "median": round(statistics.median(ms), 2), "max": round(max(ms), 2)}
+
+def run_case(name, repeat):
+    measure(name)   # warm-up: writes the bytecode cache, warms the OS file cache
+    samples = [measure(name) for _ in range(repeat)]
+    return {
+        "statement_ms": summarize([s["seconds"] for s in samples]) if name != "cli_help" else None,
+        "process_ms": summarize([s["process_seconds"] for s in samples]),
+        "loaded": samples[-1]["loaded"],
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Import-time benchmark for usps_address_validator.")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case (default 10)")
+    parser.add_argument("--cases", nargs="+", choices=list(IMPORT_CASES) + ["cli_help"],
+                        default=list(IMPORT_CASES) + ["cli_help"])
+    parser.add_argument("--max-import-ms", type=float,
+                        help="fail (exit 1) if the median `import` case is slower than this")
+    parser.add_argument("--output", help="results JSON (default benchmarks/results/startup-<timestamp>.json)")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    cases = list(args.cases)
+    if args.max_import_ms is not None and "import" not in cases:
+        cases.append("import")
+
+    results = {}
+    for name in cases:
+        result = results[name] = run_case(name, args.repeat)
+        line = f"{name:12} process {result['process_ms']['median']:7.1f} ms"
+        if result["statement_ms"] is not None:
+            line += f"  statement {result['statement_ms']['median']:7.1f} ms"
+        if result["loaded"] is not None:
+            line += f"  loaded: {', '.join(result['loaded']) or '-'}"
+        print(line, file=sys.stderr)
+
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, "startup-" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}", file=sys.stderr)
+
+    import_ms = results["import"]["statement_ms"]["median"] if "import" in results else None
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"import took {import_ms} ms (limit {args.max_import_ms} ms)", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+End-to-end throughput benchmark: runs the validator's file pipeline against the
+local mock USPS server (usps_mock_server.py) and records rows/sec, request
+latency percentiles, peak RSS and time spent reading, validating and writing.
+
+Every case runs in a fresh subprocess so peak RSS belongs to that case alone.
+The mock server runs in this (parent) process. Credentials live in an
+in-memory keyring inside the child, so your real keyring is never touched.
+
+Examples:
+
+    uv run python benchmarks/throughput.py                  # quick matrix
+    uv run python benchmarks/throughput.py --rows 1000 100000 1000000 \\
+        --concurrency 8 32 64 --cache cold warm --dup-ratio 0 0.5 --format csv
+
+Results are written as JSON (default benchmarks/results/<timestamp>.json) so
+runs can be compared over time.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import usps_mock_server  # noqa: E402
+
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), "usps_validator_bench")
+DEFAULT_RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+STREETS = ["Main", "Oak", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill", "Park", "Pine"]
+SUFFIXES = ["Street", "Avenue", "Road", "Drive", "Lane", "Court", "Boulevard"]
+CITIES = [("Raleigh", "NC", "27601"), ("Austin", "TX", "78701"), ("Denver", "CO", "80202"),
+          ("San Juan", "PR", "00907"), ("Portland", "OR", "97201"), ("Boston", "MA", "02108")]
+
+########################################################################
+# Synthetic Input Files
+########################################################################
+
+def synthetic_rows(rows, dup_ratio, seed=0):
+    """
+    Yield `rows` address rows of which about dup_ratio repeat an earlier address
+    (with different IDs). Deterministic for a given seed.
+    """
+    rng = random.Random(seed)
+    unique = max(1, round(rows * (1 - dup_ratio)))
+    for i in range(rows):
+        n = i if i < unique else rng.randrange(unique)
+        city, state, zip_code = CITIES[n % len(CITIES)]
+        yield {
+            "RecordID": i + 1,
+            "CustomerID": 1000 + i % 997,
+            "firm": "",
+            "streetAddress": f"{100 + n} {STREETS[n % len(STREETS)]} {SUFFIXES[n // 10 % len(SUFFIXES)]}",
+            "secondaryAddress": f"Apt {n % 50}" if n % 7 == 0 else "",
+            "city": city,
+            "state": state,
+            # Every third row omits the ZIP to exercise city-only lookups
+            "ZIPCode": zip_code if n % 3 else "",
+            "Notes": f"row {i}",
+        }
+
+def write_synthetic_file(path, rows, dup_ratio, seed=0):
+    """Write a synthetic input file; the extension picks CSV, gzip-CSV, Parquet or Excel."""
+    import pandas as pd
+
+    data = synthetic_rows(rows, dup_ratio, seed)
+    if path.endswith(".xlsx"):
+        # Row by row keeps 1M-row workbooks within memory
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        columns = None
+        if xlsxwriter is not None:
+            wb = xlsxwriter.Workbook(path, {"constant_memory": True})
+            ws = wb.add_worksheet()
+            for r, row in enumerate(data):
+                if columns is None:
+                    columns = list(row)
+                    ws.write_row(0, 0, columns)
+                ws.write_row(r + 1, 0, [row[name] for name in columns])
+            wb.close()
+        else:
+            import openpyxl
+
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet()
+            for row in data:
+                if columns is None:
+                    columns = list(row)
+                    ws.append(columns)
+                ws.append([row[name] for name in columns])
+            wb.save(path)
+        return
+
+    df = pd.DataFrame(list(data)).astype(str)
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def input_file(work_dir, rows, dup_ratio, fmt, seed=0):
+    """Path of the synthetic input for these settings, generated on first use."""
+    ext = {"xlsx": ".xlsx", "csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}[fmt]
+    path = os.path.join(work_dir, f"input_{rows}_dup{dup_ratio:g}_seed{seed}{ext}")
+    if not os.path.exists(path):
+        os.makedirs(work_dir, exist_ok=True)
+        print(f"  generating {os.path.basename(path)}", file=sys.stderr, flush=True)
+        tmp = path + ".tmp" + ext
+        write_synthetic_file(tmp, rows, dup_ratio, seed)
+        os.replace(tmp, path)
+    return path
+
+########################################################################
+# Child Process: one measured run
+########################################################################
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        # Windows: no resource module
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def use_memory_keyring():
+    import keyring
+    from keyring.backend import KeyringBackend
+
+    class MemoryKeyring(KeyringBackend):
+        priority = 1
+
+        def __init__(self):
+            super().__init__()
+            self.values = {}
+
+        def get_password(self, service, username):
+            return self.values.get((service, username))
+
+        def set_password(self, service, username, password):
+            self.values[(service, username)] = password
+
+        def delete_password(self, service, username):
+            self.values.pop((service, username), None)
+
+    keyring.set_keyring(MemoryKeyring())
+
+def run_case(case):
+    """Validate one file as described by `case` (a dict) and return its measurements."""
+    use_memory_keyring()
+    import usps_address_validator as validator
+
+    validator.set_api_base_url(case["base_url"])
+    validator.set_client_id("benchmark")
+    validator.set_client_secret("benchmark")
+
+    started = time.perf_counter()
+    output_path, stats = validator.validate_file(
+        case["input"],
+        max_workers=case["concurrency"],
+        cache_path=case["cache_path"],
+        rate_limit=None,
+        streaming=case["streaming"],
+        resume=False,
+        journal_dir=case["journal_dir"],
+    )
+    elapsed = time.perf_counter() - started
+    os.remove(output_path)
+    with open(stats["report_path"], encoding="utf-8") as f:
+        report = json.load(f)
+    os.remove(stats["report_path"])
+
+    result = {
+        "elapsed_seconds": round(elapsed, 4),
+        "rows_per_second": round(stats["rows"] / elapsed, 1) if elapsed > 0 else None,
+        "requests": report["requests"]["sent"],
+        "retries": report["requests"]["retries"],
+        "latency_ms": {name: report["latency_ms"][name] for name in ("p50", "p95", "p99")},
+        "peak_rss_mb": peak_rss_mb(),
+        "stages_seconds": report["stages_seconds"],
+        "stats": {name: value for name, value in stats.items() if name != "report_path"},
+    }
+    if result["peak_rss_mb"] is not None:
+        result["peak_rss_mb"] = round(result["peak_rss_mb"], 1)
+    return result
+
+def run_case_in_subprocess(case):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", json.dumps(case)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"benchmark case failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+########################################################################
+# Parent: the benchmark matrix
+########################################################################
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Throughput benchmark against the local mock USPS server.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000],
+                        help="input sizes (default: 1000 10000; try up to 1000000)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32], help="worker counts")
+    parser.add_argument("--cache", nargs="+", choices=["cold", "warm", "off"], default=["cold", "warm"],
+                        help="result cache state for the measured run")
+    parser.add_argument("--dup-ratio", type=float, nargs="+", default=[0.0, 0.5],
+                        help="fraction of rows repeating an earlier address")
+    parser.add_argument("--format", default="csv", choices=["xlsx", "csv", "csv.gz", "parquet"],
+                        help="input/output format (default csv)")
+    parser.add_argument("--streaming", action=argparse.BooleanOptionalAction, default=None,
+                        help="force streaming on/off (default: the validator's choice per format)")
+    parser.add_argument("--latency", default="lognormal:20,0.4", help="mock latency spec, ms (see usps-mock-server)")
+    parser.add_argument("--mock-rate-limit", type=float, help="per-client limit enforced by the mock")
+    parser.add_argument("--error-rate-5xx", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="generated inputs and caches")
+    parser.add_argument("--output", help="results JSON (default benchmarks/results/<timestamp>.json)")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    server = usps_mock_server.start_mock_server(latency=args.latency, rate_limit=args.mock_rate_limit,
+                                                error_rate_5xx=args.error_rate_5xx, seed=args.seed)
+    results = []
+    os.makedirs(args.work_dir, exist_ok=True)
+    cache_dir = tempfile.mkdtemp(prefix="cache_", dir=args.work_dir)
+    journal_dir = os.path.join(cache_dir, "journals")
+    try:
+        for rows in args.rows:
+            for dup_ratio in args.dup_ratio:
+                path = input_file(args.work_dir, rows, dup_ratio, args.format, args.seed)
+                for concurrency in args.concurrency:
+                    for cache_state in args.cache:
+                        cache_path = None
+                        if cache_state != "off":
+                            cache_path = os.path.join(
+                                cache_dir, f"{rows}_{dup_ratio:g}_{concurrency}_{cache_state}.sqlite3")
+                        case = {
+                            "input": path, "base_url": server.base_url, "concurrency": concurrency,
+                            "cache_path": cache_path, "streaming": args.streaming, "journal_dir": journal_dir,
+                        }
+                        if cache_state == "warm":
+                            run_case_in_subprocess(case)   # fill the cache; not measured
+                        print(f"rows={rows} dup={dup_ratio:g} concurrency={concurrency} cache={cache_state}",
+                              file=sys.stderr, flush=True)
+                        measured = run_case_in_subprocess(case)
+                        print(f"  {measured['rows_per_second']} rows/s, p95 {measured['latency_ms']['p95']} ms, "
+                              f"peak RSS {measured['peak_rss_mb']} MB", file=sys.stderr, flush=True)
+                        results.append({
+                            "rows": rows, "dup_ratio": dup_ratio, "concurrency": concurrency,
+                            "cache": cache_state, "format": args.format, "streaming": args.streaming,
+                            **measured,
+                        })
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "mock": {"latency": args.latency, "rate_limit": args.mock_rate_limit, "error_rate_5xx": args.error_rate_5xx},
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(run_case(json.loads(sys.argv[2]))))
+        sys.exit(0)
+    sys.exit(main())
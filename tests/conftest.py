@@ -0,0 +1,62 @@
+import keyring
+import pytest
+from keyring.backend import KeyringBackend
+
+import usps_address_validator as validator
+import usps_mock_server
+
+class MemoryKeyring(KeyringBackend):
+    priority = 1
+
+    def __init__(self):
+        super().__init__()
+        self.values = {}
+
+    def get_password(self, service, username):
+        return self.values.get((service, username))
+
+    def set_password(self, service, username, password):
+        self.values[(service, username)] = password
+
+    def delete_password(self, service, username):
+        self.values.pop((service, username), None)
+
+@pytest.fixture(autouse=True)
+def memory_keyring(monkeypatch):
+    """Keep every test away from the real keyring and the shared token manager."""
+    previous = keyring.get_keyring()
+    keyring.set_keyring(MemoryKeyring())
+    validator.clear_credential_cache()
+    monkeypatch.setattr(validator, "_token_manager", None)
+    yield
+    keyring.set_keyring(previous)
+    validator.clear_credential_cache()
+
+@pytest.fixture
+def mock_api():
+    """
+    Factory: start_mock_server(**options) with the validator pointed at it and
+    test credentials stored. Servers are shut down and the base URL restored.
+    """
+    servers = []
+    previous_base_url = validator.USPS_API_BASE_URL
+
+    def start(**options):
+        options.setdefault("latency", "0")
+        server = usps_mock_server.start_mock_server(**options)
+        servers.append(server)
+        validator.set_api_base_url(server.base_url)
+        validator.set_client_id("test-client")
+        validator.set_client_secret("test-secret")
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+    validator.set_api_base_url(previous_base_url)
+
+@pytest.fixture
+def fast_retries():
+    """A RetryPolicy that does not sleep for long, for fault-injection runs."""
+    return validator.RetryPolicy(20, base_delay=0.001, max_delay=0.01)
@@ -0,0 +1,41 @@
+"""The asyncio path (httpx) gives the same results as the threaded one."""
+import asyncio
+
+import pandas as pd
+import pytest
+
+import usps_address_validator as validator
+
+pytest.importorskip("httpx")
+
+@pytest.fixture
+def addresses():
+    rows = [{"RecordID": i, "streetAddress": f"{i % 7} Main St", "state": "NC", "city": "Raleigh",
+             "ZIPCode": 27601 if i % 2 else None} for i in range(20)]
+    rows.append({"RecordID": 99, "streetAddress": None, "state": "NC", "city": "Raleigh", "ZIPCode": None})
+    return pd.DataFrame(rows)
+
+def test_validate_frame_async_matches_validate_frame(mock_api, addresses):
+    mock_api()
+    token = validator.get_token_manager().get_token()
+    sync_stats, async_stats = {}, {}
+
+    expected = validator.validate_frame(addresses.copy(), token, max_workers=4, stats=sync_stats)
+    result = asyncio.run(validator.validate_frame_async(addresses.copy(), token, max_concurrency=4,
+                                                        stats=async_stats))
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert async_stats == {key: sync_stats[key] for key in async_stats}
+
+def test_process_file_async_writes_the_same_file(mock_api, addresses, tmp_path):
+    mock_api()
+    sync_input = str(tmp_path / "sync.csv")
+    async_input = str(tmp_path / "async.csv")
+    addresses.to_csv(sync_input, index=False)
+    addresses.to_csv(async_input, index=False)
+
+    sync_output, _ = validator.validate_file(sync_input, cache_path=None, journal_dir=None, report=False,
+                                             streaming=False)
+    async_output = asyncio.run(validator.process_file_async(async_input, cache_path=None, report=False))
+
+    pd.testing.assert_frame_equal(pd.read_csv(async_output, dtype=str), pd.read_csv(sync_output, dtype=str))
@@ -0,0 +1,43 @@
+"""usps-validate exit codes."""
+import os
+
+import pandas as pd
+import pytest
+
+import usps_address_validator as validator
+
+@pytest.fixture
+def address_csv(tmp_path):
+    path = str(tmp_path / "addresses.csv")
+    pd.DataFrame({"streetAddress": ["1 Main St", "2 Main St"], "state": "NC",
+                  "city": "Raleigh"}).to_csv(path, index=False)
+    return path
+
+@pytest.fixture
+def run(tmp_path):
+    """cli_main with the cache, report and checkpoint journals kept out of the way."""
+    def run(*argv):
+        return validator.cli_main(["-q", "--no-cache", "--no-report", "--no-resume",
+                                   "--journal-dir", str(tmp_path / "journals"), *argv])
+    return run
+
+def test_every_row_validated(mock_api, address_csv, run):
+    mock_api()
+    assert run(address_csv) == validator.EXIT_OK
+    assert os.path.exists(validator.validated_output_path(address_csv))
+
+def test_unreadable_file_fails(mock_api, address_csv, run, tmp_path):
+    mock_api()
+    missing = str(tmp_path / "missing.csv")
+    assert run(missing, address_csv) == validator.EXIT_FAILED
+    assert os.path.exists(validator.validated_output_path(address_csv))
+
+def test_failed_lookups_are_reported(mock_api, address_csv, run):
+    mock_api(error_rate_5xx=1.0)
+    assert run("--max-attempts", "1", address_csv) == validator.EXIT_ROW_ERRORS
+
+@pytest.mark.parametrize("workers", ["0", str(validator.MAX_WORKERS_LIMIT + 1)])
+def test_out_of_range_workers_are_rejected(address_csv, run, capsys, workers):
+    assert run("--workers", workers, address_csv) == validator.EXIT_USAGE
+    assert "--workers" in capsys.readouterr().err
+    assert not os.path.exists(validator.validated_output_path(address_csv))
@@ -0,0 +1,52 @@
+"""Process-wide metrics in the Prometheus text format."""
+import urllib.request
+
+import usps_address_validator as validator
+
+def sample_lines(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+def test_render_counters_gauges_and_histogram():
+    metrics = validator.ServiceMetrics()
+    run = validator.RunMetrics(parent=metrics)
+    run.observe_request(0.003, 200)
+    run.observe_request(0.2, 429)
+    run.observe_request(30.0, None)
+    run.count("rows", 5)
+    run.gauge_add("in_flight", 2)
+
+    text = metrics.render()
+    samples = sample_lines(text)
+
+    assert "# TYPE usps_validator_requests_total counter" in text
+    assert samples["usps_validator_requests_total"] == "3"
+    assert samples["usps_validator_request_errors_total"] == "1"
+    assert samples["usps_validator_throttled_total"] == "1"
+    assert samples["usps_validator_rows_total"] == "5"
+    assert samples["usps_validator_cache_hits_total"] == "0"
+    assert samples['usps_validator_responses_total{status_class="2xx"}'] == "1"
+    assert samples['usps_validator_responses_total{status_class="4xx"}'] == "1"
+    assert samples["usps_validator_in_flight_requests"] == "2"
+
+    histogram = "usps_validator_request_duration_seconds"
+    assert f"# TYPE {histogram} histogram" in text
+    assert samples[f'{histogram}_bucket{{le="0.005"}}'] == "1"
+    assert samples[f'{histogram}_bucket{{le="0.25"}}'] == "2"
+    assert samples[f'{histogram}_bucket{{le="10.0"}}'] == "2"
+    assert samples[f'{histogram}_bucket{{le="+Inf"}}'] == "3"
+    assert samples[f"{histogram}_count"] == "3"
+    assert float(samples[f"{histogram}_sum"]) == 30.203
+
+def test_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(validator, "_service_metrics", None)
+    server = validator.start_metrics_server(port=0)
+    try:
+        validator.RunMetrics().count("rows", 7)
+        host, port = server.server_address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+            text = response.read().decode("utf-8")
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert sample_lines(text)["usps_validator_rows_total"] == "7"
+    finally:
+        server.shutdown()
+        server.server_close()
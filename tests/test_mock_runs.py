@@ -0,0 +1,232 @@
+"""
+End-to-end runs against usps_mock_server: fault injection, journal resume,
+the result cache, and streaming vs whole-file output.
+"""
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+import usps_address_validator as validator
+
+def address_frame(unique=30, repeat=2):
+    rows = []
+    for i in range(unique * repeat):
+        rows.append({"RecordID": i, "streetAddress": f"{i % unique} Main St", "state": "NC",
+                     "city": "Raleigh", "ZIPCode": 27601 if i % unique % 3 else None})
+    # One row the API would reject, never sent
+    rows.append({"RecordID": 999, "streetAddress": None, "state": "NC", "city": "Raleigh", "ZIPCode": None})
+    return pd.DataFrame(rows)
+
+def run_frame(df, retry_policy=None, max_attempts=validator.DEFAULT_MAX_ATTEMPTS, token=None, cache=None):
+    metrics = validator.RunMetrics()
+    stats = {}
+    with validator.AddressValidator(token=token, max_workers=4, cache=cache, rate_limit=None,
+                                    max_attempts=max_attempts, metrics=metrics) as engine:
+        if retry_policy is not None:
+            engine.retry_policy = retry_policy
+        result = engine.validate_dataframe(df, stats=stats)
+    return result, stats, metrics.report(stats, "frame", "frame")
+
+def validation_errors(result):
+    return result["ValidationError"].dropna().tolist() if "ValidationError" in result else []
+
+########################################################################
+# Fault injection
+########################################################################
+
+def test_injected_429s_are_retried_until_every_address_succeeds(mock_api, fast_retries):
+    server = mock_api(error_rate_429=0.4, retry_after=0, seed=1)
+    result, stats, report = run_frame(address_frame(), fast_retries)
+
+    assert validation_errors(result) == [validator.MISSING_FIELDS_ERROR]
+    assert server.stats()["status_429"] > 0
+    assert report["requests"]["throttled_429"] == server.stats()["status_429"]
+    assert report["requests"]["retries"] >= server.stats()["status_429"]
+    assert stats["failed_rows"] == 0
+
+def test_injected_5xx_retries_gateway_errors_and_fails_500s(mock_api, fast_retries):
+    server = mock_api(error_rate_5xx=0.3, seed=2)
+    result, stats, report = run_frame(address_frame(repeat=1), fast_retries)
+
+    counts = server.stats()
+    errors = [error for error in validation_errors(result) if error != validator.MISSING_FIELDS_ERROR]
+    # 502/503/504 are transient and retried; a 500 fails its address on the spot
+    assert all(error.startswith("HTTP 500") for error in errors)
+    assert len(errors) == counts.get("status_500", 0) == stats["failed_rows"]
+    assert report["requests"]["retries"] == sum(counts.get(f"status_{code}", 0) for code in (502, 503, 504))
+
+def test_5xx_that_outlasts_the_retries_is_reported_per_row(mock_api, fast_retries):
+    mock_api(error_rate_5xx=1.0, seed=3)
+    df = address_frame(unique=5, repeat=2)
+    result, stats, _ = run_frame(df, validator.RetryPolicy(2, base_delay=0.001, max_delay=0.01))
+
+    assert stats["failed_rows"] == len(df) - 1
+    assert all(error.startswith("HTTP 5") for error in validation_errors(result)
+               if error != validator.MISSING_FIELDS_ERROR)
+
+def test_401_fetches_a_new_token_once_and_retries(mock_api):
+    server = mock_api()
+    # A token the server never issued, stored as if it were still valid
+    validator.set_token("revoked-token")
+    validator.set_token_expiry(2_000_000_000)
+    result, _, report = run_frame(address_frame(unique=10, repeat=1), token=validator.TokenManager())
+
+    assert validation_errors(result) == [validator.MISSING_FIELDS_ERROR]
+    counts = server.stats()
+    assert counts["status_401"] >= 1
+    assert counts["token_requests"] == 1
+    assert report["requests"]["reauthorized_after_401"] == counts["status_401"]
+    assert validator.get_token() != "revoked-token"
+
+########################################################################
+# Checkpoint journal
+########################################################################
+
+def interrupt_after(monkeypatch, lookups):
+    fetch = validator.fetch_address_fields
+    calls = [0]
+
+    def fetch_then_interrupt(*args, **kwargs):
+        calls[0] += 1
+        if calls[0] > lookups:
+            raise KeyboardInterrupt
+        return fetch(*args, **kwargs)
+
+    monkeypatch.setattr(validator, "fetch_address_fields", fetch_then_interrupt)
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_interrupted_run_resumes_from_the_journal(mock_api, monkeypatch, tmp_path, streaming):
+    server = mock_api()
+    input_path = str(tmp_path / "addresses.csv")
+    address_frame(unique=40).to_csv(input_path, index=False)
+    journal_dir = str(tmp_path / "journals")
+    options = dict(cache_path=None, journal_dir=journal_dir, max_workers=1, streaming=streaming, chunk_size=25,
+                   report=False)
+
+    reference_path, _ = validator.validate_file(input_path, output_path=str(tmp_path / "reference.csv"),
+                                                **options)
+    # Streamed chunks dedup on their own, so an address can be sent once per chunk
+    reference_requests = server.stats()["address_requests"]
+    assert glob.glob(os.path.join(journal_dir, "*")) == []
+
+    with monkeypatch.context() as patch:
+        interrupt_after(patch, 15)
+        with pytest.raises(KeyboardInterrupt):
+            validator.validate_file(input_path, **options)
+    assert len(glob.glob(os.path.join(journal_dir, "*.jsonl"))) == 1
+
+    before = server.stats()["address_requests"]
+    output_path, stats = validator.validate_file(input_path, **options)
+    assert server.stats()["address_requests"] - before == reference_requests - 15
+    # Whole file: 15 addresses with two rows each; streamed: the first 15 rows of the first chunk
+    assert stats["rows_resumed"] == (15 if streaming else 30)
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), pd.read_csv(reference_path))
+    assert glob.glob(os.path.join(journal_dir, "*")) == []
+
+def test_torn_journal_line_is_dropped_before_appending(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"rows":[0],"fields":{"Standardized_City":"A"}}\n{"rows":[1],"fie')
+
+    journal = validator.ValidationJournal(path)
+    assert journal.completed_rows(0, 3) == {0: {"Standardized_City": "A"}}
+    journal.record([2], {"Standardized_City": "C"})
+    journal.close()
+
+    assert sorted(validator.ValidationJournal(path, resume=True).completed_rows(0, 3)) == [0, 2]
+
+########################################################################
+# Result cache
+########################################################################
+
+def test_cache_miss_then_hit(mock_api, tmp_path):
+    server = mock_api()
+    cache = validator.ValidationCache(str(tmp_path / "cache.sqlite3"))
+    df = address_frame(unique=12)
+    try:
+        first, _, cold = run_frame(df, cache=cache)
+        assert cold["cache"] == {"hits": 0, "misses": 12}
+        assert server.stats()["address_requests"] == 12
+
+        second, _, warm = run_frame(df, cache=cache)
+        assert warm["cache"] == {"hits": 12, "misses": 0}
+        assert server.stats()["address_requests"] == 12
+        pd.testing.assert_frame_equal(first, second)
+    finally:
+        cache.close()
+
+def test_cache_entries_are_kept_apart_per_base_url(mock_api, tmp_path):
+    cache = validator.ValidationCache(str(tmp_path / "cache.sqlite3"))
+    df = address_frame(unique=5, repeat=1)
+    try:
+        mock_api()
+        run_frame(df, cache=cache)
+        other = mock_api()
+        _, _, report = run_frame(df, cache=cache)
+        assert report["cache"] == {"hits": 0, "misses": 5}
+        # The first server's token means nothing here, so a 401 and a new token come first
+        assert other.stats()["status_200"] == 5
+    finally:
+        cache.close()
+
+def test_default_cache_is_off_for_non_production_servers(mock_api):
+    mock_api()
+    assert validator.get_cache(validator.DEFAULT_CACHE_PATH) is None
+
+########################################################################
+# Streaming vs whole-file output
+########################################################################
+
+def write_input(df, path):
+    if path.endswith(".xlsx"):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def read_output(path):
+    return pd.read_excel(path) if path.endswith(".xlsx") else pd.read_csv(path)
+
+@pytest.mark.parametrize("extension", [".csv", ".xlsx"])
+def test_streaming_output_matches_whole_file_output(mock_api, tmp_path, extension):
+    mock_api()
+    df = address_frame(unique=30, repeat=3)
+    df["Notes"] = [f"note {i}" for i in range(len(df))]
+    input_path = str(tmp_path / f"addresses{extension}")
+    write_input(df, input_path)
+    options = dict(cache_path=None, journal_dir=None, report=False)
+
+    whole_path, whole_stats = validator.validate_file(input_path, output_path=str(tmp_path / f"whole{extension}"),
+                                                      streaming=False, **options)
+    streamed_path, streamed_stats = validator.validate_file(
+        input_path, output_path=str(tmp_path / f"streamed{extension}"), streaming=True, chunk_size=40, **options)
+
+    whole, streamed = read_output(whole_path), read_output(streamed_path)
+    # The streamed layout is fixed up front, so it always carries every output column
+    assert set(whole.columns) <= set(streamed.columns)
+    assert streamed.drop(columns=list(whole.columns)).isna().all().all()
+    pd.testing.assert_frame_equal(whole, streamed[whole.columns], check_dtype=False)
+    assert whole_stats["rows"] == streamed_stats["rows"] == len(df)
+
+def test_streaming_excel_keeps_duplicate_headers_apart(mock_api, tmp_path):
+    import openpyxl
+
+    mock_api()
+    input_path = str(tmp_path / "duplicates.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["streetAddress", "note", "state", "note", "city", "note.1", "note"])
+    for i in range(30):
+        sheet.append([f"{i % 10} Main St", f"a{i}", "NC", f"b{i}", "Raleigh", f"c{i}", f"d{i}"])
+    workbook.save(input_path)
+    options = dict(cache_path=None, journal_dir=None, report=False)
+
+    whole_path, _ = validator.validate_file(input_path, output_path=str(tmp_path / "whole.xlsx"),
+                                            streaming=False, **options)
+    streamed_path, _ = validator.validate_file(input_path, output_path=str(tmp_path / "streamed.xlsx"),
+                                               streaming=True, chunk_size=8, **options)
+
+    whole, streamed = pd.read_excel(whole_path), pd.read_excel(streamed_path)
+    assert list(whole.columns[:7]) == ["streetAddress", "note", "state", "note.2", "city", "note.1", "note.3"]
+    pd.testing.assert_frame_equal(whole, streamed[whole.columns], check_dtype=False)
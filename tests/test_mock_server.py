@@ -0,0 +1,40 @@
+"""usps_mock_server on its own: seeding and fault injection."""
+import random
+
+import requests
+
+import usps_mock_server
+
+def statuses(server, count=30):
+    session = requests.Session()
+    token = session.post(f"{server.base_url}/oauth2/v3/token",
+                         data={"grant_type": "client_credentials", "client_id": "c", "client_secret": "s"},
+                         timeout=10).json()["access_token"]
+    url = f"{server.base_url}/addresses/v3/address"
+    params = {"streetAddress": "1 Main St", "state": "NC", "city": "Raleigh"}
+    return [session.get(url, params=params, headers={"Authorization": f"Bearer {token}"}, timeout=10).status_code
+            for _ in range(count)]
+
+def test_seed_does_not_touch_the_global_random_state():
+    random.seed(1234)
+    expected = [random.random() for _ in range(3)]
+    random.seed(1234)
+    server = usps_mock_server.start_mock_server(seed=7, latency="0")
+    try:
+        assert [random.random() for _ in range(3)] == expected
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_same_seed_gives_the_same_fault_sequence():
+    results = []
+    for _ in range(2):
+        server = usps_mock_server.start_mock_server(seed=11, latency="uniform:0,1", error_rate_429=0.2,
+                                                    error_rate_5xx=0.2, retry_after=0)
+        try:
+            results.append(statuses(server))
+        finally:
+            server.shutdown()
+            server.server_close()
+    assert results[0] == results[1]
+    assert len(set(results[0])) > 1
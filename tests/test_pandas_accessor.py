@@ -0,0 +1,58 @@
+"""The df.usps accessor (usps_pandas)."""
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import usps_address_validator as validator
+import usps_pandas  # noqa: F401
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize("imports", [
+    "import usps_address_validator; import pandas; import usps_pandas",
+    "import pandas; import usps_address_validator",
+    "import usps_pandas",
+])
+def test_accessor_is_registered_in_any_import_order(imports):
+    code = f"{imports}\nimport pandas\nprint(hasattr(pandas.DataFrame(), 'usps'))"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                          env={**os.environ, "PYTHONPATH": ROOT})
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "True"
+
+def test_accessor_adds_output_columns_on_the_original_index(mock_api):
+    mock_api()
+    df = pd.DataFrame({
+        "RecordID": [1, 2, 3, 4],
+        "streetAddress": ["1 Main St", "1 Main St", "2 Oak Ave", None],
+        "state": ["NC", "NC", "NC", "NC"],
+        "city": ["Raleigh", "Raleigh", "Durham", "Durham"],
+        "ZIPCode": [907, 907, None, None],
+    }, index=["a", "b", "c", "d"])
+    stats = {}
+
+    validated = df.usps.validate(concurrency=2, cache=None, rate_limit=None, stats=stats)
+
+    assert list(validated.index) == ["a", "b", "c", "d"]
+    assert list(validated.columns) == list(df.columns) + validator.OUTPUT_COLUMNS
+    # Input columns come back untouched; ZIPs are only normalized for the request
+    pd.testing.assert_frame_equal(validated[df.columns], df)
+    assert stats["unique_addresses"] == 2 and stats["requests_saved"] == 1
+    assert validated.loc["a", "Standardized_StreetAddress"] == validated.loc["b", "Standardized_StreetAddress"]
+    assert validated.loc["d", "ValidationError"] == validator.MISSING_FIELDS_ERROR
+    assert validated.loc[["a", "b", "c"], "ValidationError"].isna().all()
+
+def test_accessor_matches_validate_dataframe(mock_api):
+    mock_api()
+    df = pd.DataFrame({"streetAddress": [f"{i % 5} Main St" for i in range(12)], "state": "NC",
+                       "city": "Raleigh"})
+
+    validated = df.usps.validate(cache=None, rate_limit=None)
+    with validator.AddressValidator(cache=None, rate_limit=None) as engine:
+        reference = engine.validate_dataframe(df)
+
+    for name in ["Standardized_StreetAddress", "Standardized_ZIPCode", "DPVConfirmation"]:
+        assert validated[name].tolist() == reference[name].tolist()
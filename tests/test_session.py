@@ -0,0 +1,33 @@
+"""Shared requests.Session and its connection pool."""
+import pytest
+
+import usps_address_validator as validator
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    validator.close_session()
+    yield
+    validator.close_session()
+
+def test_session_is_shared():
+    assert validator.get_session() is validator.get_session()
+
+def test_resizing_the_pool_closes_the_old_adapter(monkeypatch):
+    session = validator.get_session(4)
+    old_adapter = session.get_adapter("https://apis.usps.com")
+    closed = []
+    monkeypatch.setattr(old_adapter, "close", lambda: closed.append(old_adapter))
+
+    assert validator.get_session(8) is session
+    new_adapter = session.get_adapter("https://apis.usps.com")
+
+    assert closed == [old_adapter]
+    assert new_adapter is not old_adapter
+    assert new_adapter._pool_maxsize == 8
+    assert session.get_adapter("http://localhost") is new_adapter
+
+def test_same_pool_size_keeps_the_adapter():
+    session = validator.get_session(4)
+    adapter = session.get_adapter("https://apis.usps.com")
+    validator.get_session(4)
+    assert session.get_adapter("https://apis.usps.com") is adapter
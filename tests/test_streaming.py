@@ -0,0 +1,39 @@
+"""Streaming mode: when it is used by default."""
+import pandas as pd
+import pytest
+
+import usps_address_validator as validator
+
+def refuse_whole_file_read(*args, **kwargs):
+    raise AssertionError("the whole file was read into memory")
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "addresses.xlsx")
+    pd.DataFrame({"streetAddress": [f"{i} Main St" for i in range(20)], "state": "NC",
+                  "city": "Raleigh"}).to_excel(path, index=False)
+    return path
+
+def test_large_workbooks_are_streamed_by_default(mock_api, monkeypatch, workbook):
+    mock_api()
+    monkeypatch.setattr(validator, "EXCEL_STREAMING_THRESHOLD", 10)
+    monkeypatch.setattr(validator, "read_input_frame", refuse_whole_file_read)
+
+    _, stats = validator.validate_file(workbook, cache_path=None, journal_dir=None, report=False)
+
+    assert stats["rows"] == 20
+
+def test_small_workbooks_are_read_whole_by_default(mock_api, monkeypatch, workbook):
+    mock_api()
+    read = []
+    read_input_frame = validator.read_input_frame
+
+    def spy(*args, **kwargs):
+        read.append(args[0])
+        return read_input_frame(*args, **kwargs)
+
+    monkeypatch.setattr(validator, "read_input_frame", spy)
+
+    validator.validate_file(workbook, cache_path=None, journal_dir=None, report=False)
+
+    assert read == [workbook]
@@ -0,0 +1,72 @@
+"""TokenManager: one /token request per refresh, however many workers need it."""
+import threading
+import time
+
+import usps_address_validator as validator
+
+def store_expired_token():
+    validator.set_token("expired-token")
+    validator.set_token_expiry(time.time() - 60)
+
+def call_from_threads(target, count=8):
+    barrier = threading.Barrier(count)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(target())
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_callers_share_one_refresh_of_an_expired_token(mock_api):
+    server = mock_api(token_latency="fixed:50")
+    store_expired_token()
+    manager = validator.TokenManager()
+
+    tokens = call_from_threads(manager.get_token)
+
+    assert server.stats()["token_requests"] == 1
+    assert len(set(tokens)) == 1 and tokens[0] != "expired-token"
+
+def test_concurrent_callers_share_one_first_token(mock_api):
+    server = mock_api(token_latency="fixed:50")
+    manager = validator.TokenManager()
+
+    call_from_threads(manager.get_token)
+
+    assert server.stats()["token_requests"] == 1
+
+def test_validate_many_fans_out_on_a_single_token_request(mock_api):
+    server = mock_api(token_latency="fixed:50")
+    rows = [{"streetAddress": f"{i} Main St", "state": "NC", "city": "Raleigh"} for i in range(40)]
+
+    with validator.AddressValidator(token=validator.TokenManager(), max_workers=8, cache=None,
+                                    rate_limit=None) as engine:
+        results = dict(engine.validate_many(rows))
+
+    assert len(results) == 40
+    assert server.stats()["token_requests"] == 1
+
+def test_failed_background_refresh_waits_for_the_cooldown(monkeypatch):
+    validator.set_token("current-token")
+    validator.set_token_expiry(time.time() + 60)   # inside the refresh margin
+    attempts = []
+
+    def failing_request(session=None):
+        attempts.append(time.monotonic())
+        raise validator.USPSValidatorError("Token request failed")
+
+    monkeypatch.setattr(validator, "request_oauth_token", failing_request)
+    manager = validator.TokenManager(refresh_cooldown=30)
+    deadline = time.monotonic() + 0.5
+    while time.monotonic() < deadline:
+        # The old token stays in use while the refresh keeps failing
+        assert manager.peek() == "current-token"
+        time.sleep(0.005)
+
+    assert len(attempts) == 1
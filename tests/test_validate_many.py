@@ -0,0 +1,51 @@
+"""AddressValidator.validate_many: streaming lookups over an iterable of rows."""
+import itertools
+
+import pytest
+
+import usps_address_validator as validator
+
+def address_rows(n, unique):
+    for i in range(n):
+        yield {"RecordID": i, "streetAddress": f"{i % unique} Main St", "state": "NC", "city": "Raleigh"}
+
+@pytest.fixture
+def engine():
+    with validator.AddressValidator(max_workers=4, cache=None, rate_limit=None) as engine:
+        yield engine
+
+def test_every_row_comes_back_once_with_its_index(mock_api, engine):
+    mock_api()
+    rows = list(address_rows(40, unique=40))
+    rows.insert(5, {"RecordID": "blank", "streetAddress": None, "state": "NC"})
+
+    results = dict(engine.validate_many(rows))
+
+    assert sorted(results) == list(range(len(rows)))
+    for index, result in results.items():
+        assert result["RecordID"] == rows[index]["RecordID"]
+    assert results[5]["ValidationError"] == validator.MISSING_FIELDS_ERROR
+    assert all(result.get("ValidationError") is None for index, result in results.items() if index != 5)
+
+def test_repeated_addresses_share_one_request(mock_api, engine):
+    server = mock_api()
+
+    results = dict(engine.validate_many(address_rows(60, unique=6)))
+
+    assert len(results) == 60
+    assert server.stats()["address_requests"] == 6
+    for index, result in results.items():
+        assert result["streetAddress"].upper() == results[index % 6]["streetAddress"].upper()
+
+def test_rows_are_consumed_lazily_and_closing_cancels(mock_api, engine):
+    server = mock_api(latency="fixed:20")
+    consumed = []
+    rows = (consumed.append(row) or row for row in address_rows(10_000, unique=10_000))
+
+    results = engine.validate_many(rows)
+    first = list(itertools.islice(results, 3))
+    results.close()
+
+    assert len(first) == 3
+    assert len(consumed) <= 2 * engine.max_workers + 3
+    assert server.stats()["address_requests"] <= len(consumed)
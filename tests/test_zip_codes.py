@@ -0,0 +1,53 @@
+"""ZIP code clean-up: lost leading zeros, combined ZIP+4 values, odd numbers."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import usps_address_validator as validator
+
+@pytest.mark.parametrize("value, expected", [
+    (907, "00907"),
+    (907.0, "00907"),
+    ("907", "00907"),
+    ("907.0", "00907"),
+    (" 27601 ", "27601"),
+    (None, ""),
+    (float("nan"), ""),
+    (907.5, "907.5"),
+    (float("inf"), "inf"),
+])
+def test_clean_zip(value, expected):
+    assert validator.clean_zip(value) == expected
+
+def test_numeric_column_gets_its_leading_zeros_back():
+    zips, plus4 = validator.normalize_zip_series(pd.Series([907.0, 27601.0, None, 501.0]), 5)
+    assert zips.tolist()[:2] == ["00907", "27601"] and pd.isna(zips[2]) and zips[3] == "00501"
+    assert plus4.isna().all()
+
+def test_integer_column_is_padded_too():
+    zips, _ = validator.normalize_zip_series(pd.Series([907, 27601], dtype="int64"), 5)
+    assert zips.tolist() == ["00907", "27601"]
+
+def test_non_integral_and_huge_numbers_are_passed_through():
+    zips, _ = validator.normalize_zip_series(pd.Series([27601.5, 1e20, np.inf, 907.0]), 5)
+    assert zips.tolist() == ["27601.5", "1e+20", "inf", "00907"]
+
+def test_combined_zip_plus4_in_the_zipcode_column_is_split():
+    df = validator.normalize_zip_columns(pd.DataFrame({"ZIPCode": ["27601-1234", "00907-12", "27601"]}))
+    assert df["ZIPCode"].tolist() == ["27601", "00907", "27601"]
+    assert df["ZIPPlus4"].tolist()[:2] == ["1234", "0012"] and pd.isna(df["ZIPPlus4"][2])
+
+def test_full_zip_plus4_in_the_zipplus4_column_keeps_the_plus4():
+    df = validator.normalize_zip_columns(pd.DataFrame({"ZIPCode": ["27601", "27601-5678"],
+                                                       "ZIPPlus4": ["27601-1234", None]}))
+    assert df["ZIPCode"].tolist() == ["27601", "27601"]
+    assert df["ZIPPlus4"].tolist() == ["1234", "5678"]
+
+def test_request_params_use_the_cleaned_values():
+    row = {"streetAddress": "1 Main St", "state": "NC", "ZIPCode": 907.0, "ZIPPlus4": "00907-0012"}
+    params = validator.build_address_params(row)
+    assert params["ZIPCode"] == "00907" and params["ZIPPlus4"] == "0012"
+
+    df, keys, unique_params = validator.prepare_frame(pd.DataFrame([row]))
+    assert unique_params[keys[0]]["ZIPCode"] == "00907"
+    assert unique_params[keys[0]]["ZIPPlus4"] == "0012"
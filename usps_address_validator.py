@@ -1,9 +1,23 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox
-import pandas as pd
-import requests
-import keyring
 import os
+import threading
+import sqlite3
+import json
+import hashlib
+import time
+import random
+import math
+import csv
+import gzip
+import sys
+import argparse
+import bisect
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+# pandas, openpyxl, requests, keyring, asyncio and tkinter are imported where
+# they are first needed: together they take most of a second to import, and
+# build_address_params/validate_address only need requests. Module level code
+# must not use them.
 
 ########################################################################
 # USPS Endpoint & Keyring Constants
@@ -12,54 +26,197 @@ SERVICE_NAME = "usps_validator"    # Keyring service name
 TOKEN_KEY    = "oauth_token"       # Under which we store the USPS OAuth token
 CLIENT_ID_KEY = "client_id"        # We'll store client_id in keyring too
 CLIENT_SECRET_KEY = "client_secret"
+TOKEN_EXPIRES_KEY = "oauth_token_expires_at"   # Epoch seconds when the stored token expires
+
+# Production by default. For the testing environment use https://apis-tem.usps.com;
+# for the bundled mock server (usps_mock_server.py) e.g. http://127.0.0.1:8765.
+# Override with the USPS_API_BASE_URL environment variable or set_api_base_url().
+PRODUCTION_API_BASE_URL = "https://apis.usps.com"
+USPS_API_BASE_URL = os.environ.get("USPS_API_BASE_URL", PRODUCTION_API_BASE_URL).rstrip("/")
+
+USPS_OAUTH_TOKEN_URL = f"{USPS_API_BASE_URL}/oauth2/v3/token"      # Token endpoint
+USPS_ENDPOINT = f"{USPS_API_BASE_URL}/addresses/v3/address"        # The address standardization URL
+
+DEFAULT_MAX_WORKERS = 8   # Concurrent /address requests per file (1 = sequential)
+MAX_WORKERS_LIMIT = 64    # Upper bound offered in the GUI
+
+# Persistent cache of raw USPS responses (set cache_path=None to disable). Only
+# used by default against the production API, see get_cache().
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".usps_validator", "validation_cache.sqlite3")
+DEFAULT_CACHE_TTL = 30 * 24 * 60 * 60   # Seconds before a cached response is re-fetched
+DEFAULT_CACHE_MAX_ENTRIES = 500_000     # LRU bound on the number of cached addresses
+
+DEFAULT_RATE_LIMIT = 50.0   # Max /address requests per second across all workers (None = unlimited)
+
+DEFAULT_MAX_ATTEMPTS = 4        # Tries per address for transient failures (1 = no retries)
+DEFAULT_ROW_DEADLINE = 120.0    # Seconds one address may spend retrying before it fails
+
+TOKEN_REFRESH_MARGIN = 300      # Refresh the OAuth token this many seconds before it expires
+TOKEN_REFRESH_COOLDOWN = 30     # Seconds to wait before retrying a failed background refresh
 
-USPS_OAUTH_TOKEN_URL = "https://apis.usps.com/oauth2/v3/token"   # Production token endpoint
-# For testing environment: USPS_OAUTH_TOKEN_URL = "https://apis-tem.usps.com/oauth2/v3/token"
+STREAM_CHUNK_SIZE = 5000        # Rows per chunk when streaming large workbooks
+EXCEL_STREAMING_THRESHOLD = 50_000   # Workbooks with more rows than this are streamed by default
 
-USPS_ENDPOINT = "https://apis.usps.com/addresses/v3/address"     # The address standardization URL
+# Checkpoint journals of finished rows, so an interrupted run can resume (None disables)
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".usps_validator", "journals")
+DEFAULT_JOURNAL_FLUSH_INTERVAL = 2.0   # Max seconds of finished rows that can be lost in a crash
+
+def set_api_base_url(base_url):
+    """Point both USPS endpoints at another server (e.g. the test environment or the mock)."""
+    global USPS_API_BASE_URL, USPS_OAUTH_TOKEN_URL, USPS_ENDPOINT
+    USPS_API_BASE_URL = base_url.rstrip("/")
+    USPS_OAUTH_TOKEN_URL = f"{USPS_API_BASE_URL}/oauth2/v3/token"
+    USPS_ENDPOINT = f"{USPS_API_BASE_URL}/addresses/v3/address"
+
+def using_production_api():
+    return USPS_API_BASE_URL == PRODUCTION_API_BASE_URL
+
+class USPSValidatorError(Exception):
+    """Raised by the non-GUI entry points instead of showing a messagebox."""
 
 ########################################################################
 # Keyring / Credential Management
 ########################################################################
 
+# Some keyring backends (Secret Service over D-Bus, encrypted files) take tens to
+# hundreds of milliseconds per lookup, so reads are cached in memory for the life
+# of the process. Every setter invalidates its key; call clear_credential_cache()
+# if another process may have changed the keyring underneath us.
+_credential_cache = {}
+_credential_cache_lock = threading.Lock()
+
+def _get_credential(key):
+    with _credential_cache_lock:
+        if key in _credential_cache:
+            return _credential_cache[key]
+    import keyring
+
+    value = keyring.get_password(SERVICE_NAME, key)
+    with _credential_cache_lock:
+        _credential_cache[key] = value
+    return value
+
+def _set_credential(key, value):
+    import keyring
+
+    keyring.set_password(SERVICE_NAME, key, value)
+    invalidate_credential(key)
+
+def invalidate_credential(key):
+    """Drop one cached keyring value so the next read goes back to keyring."""
+    with _credential_cache_lock:
+        _credential_cache.pop(key, None)
+
+def clear_credential_cache():
+    with _credential_cache_lock:
+        _credential_cache.clear()
+
 def get_token():
     """Retrieve the currently stored OAuth access_token from keyring (if any)."""
-    return keyring.get_password(SERVICE_NAME, TOKEN_KEY)
+    return _get_credential(TOKEN_KEY)
 
 def set_token(token):
     """Store a new OAuth access_token in keyring."""
-    keyring.set_password(SERVICE_NAME, TOKEN_KEY, token)
+    _set_credential(TOKEN_KEY, token)
+
+def get_token_expiry():
+    """Retrieve the stored token expiry (epoch seconds) from keyring, or None if unknown."""
+    value = _get_credential(TOKEN_EXPIRES_KEY)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+def set_token_expiry(expires_at):
+    _set_credential(TOKEN_EXPIRES_KEY, str(expires_at))
 
 def get_client_id():
     """Retrieve the stored client_id from keyring."""
-    return keyring.get_password(SERVICE_NAME, CLIENT_ID_KEY)
+    return _get_credential(CLIENT_ID_KEY)
 
 def set_client_id(cid):
-    keyring.set_password(SERVICE_NAME, CLIENT_ID_KEY, cid)
+    _set_credential(CLIENT_ID_KEY, cid)
 
 def get_client_secret():
     """Retrieve the stored client_secret from keyring."""
-    return keyring.get_password(SERVICE_NAME, CLIENT_SECRET_KEY)
+    return _get_credential(CLIENT_SECRET_KEY)
 
 def set_client_secret(sec):
-    keyring.set_password(SERVICE_NAME, CLIENT_SECRET_KEY, sec)
+    _set_credential(CLIENT_SECRET_KEY, sec)
+
+########################################################################
+# Shared HTTP Session (keep-alive connection pool)
+########################################################################
+
+_session = None
+_session_pool_size = None
+_session_lock = threading.Lock()
+
+def get_session(pool_size=None):
+    """
+    Return the process-wide requests.Session so TCP/TLS connections are reused
+    across rows and across file runs. If pool_size differs from the current pool,
+    a new adapter with that many connections per host is mounted.
+    """
+    import requests
+
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        if pool_size is None:
+            pool_size = _session_pool_size or DEFAULT_MAX_WORKERS
+        if pool_size != _session_pool_size:
+            mount_connection_pool(_session, pool_size)
+            _session_pool_size = pool_size
+        return _session
+
+def new_session(pool_size=DEFAULT_MAX_WORKERS):
+    """A private requests.Session (not the shared one) keeping pool_size connections per host."""
+    import requests
+
+    session = requests.Session()
+    mount_connection_pool(session, pool_size)
+    return session
+
+def mount_connection_pool(session, pool_size):
+    """Replace the session's adapters with one keeping pool_size connections per host."""
+    from requests.adapters import HTTPAdapter
+
+    # Close the adapters being replaced so their pooled sockets are not leaked
+    previous = {id(a): a for prefix, a in session.adapters.items() if prefix in ("https://", "http://")}
+    for old_adapter in previous.values():
+        old_adapter.close()
+    adapter = HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+def close_session():
+    """Close the shared session and drop its pooled connections."""
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pool_size = None
 
 ########################################################################
 # OAuth 2.0: Client Credentials Flow
 ########################################################################
 
-def fetch_and_store_oauth_token():
+def request_oauth_token(session=None):
     """
     1. Fetch client_id and client_secret from keyring.
     2. POST to the USPS /token endpoint with grant_type=client_credentials.
-    3. If success, store the new 'access_token' in keyring so we can use it for /address calls.
+    3. Return the parsed token JSON; raise USPSValidatorError on any failure.
     """
+    import requests
+
     cid = get_client_id()
     sec = get_client_secret()
 
     if not cid or not sec:
-        messagebox.showerror("Error", "No client ID/secret found. Please set them first.")
-        return
+        raise USPSValidatorError("No client ID/secret found. Please set them first.")
 
     data = {
         "grant_type": "client_credentials",
@@ -69,58 +226,1147 @@ def fetch_and_store_oauth_token():
         "scope": "addresses",
     }
 
+    metrics = _service_metrics
+    if metrics is not None:
+        metrics.count("token_requests")
     try:
-        resp = requests.post(USPS_OAUTH_TOKEN_URL, data=data, timeout=10)
+        resp = (session or get_session()).post(USPS_OAUTH_TOKEN_URL, data=data, timeout=10)
         # Raise exception if 4xx or 5xx
         resp.raise_for_status()
     except requests.RequestException as e:
-        messagebox.showerror("Error", f"Token request failed:\n{e}")
-        return
+        if metrics is not None:
+            metrics.count("token_errors")
+        raise USPSValidatorError(f"Token request failed:\n{e}") from e
 
     try:
         token_json = resp.json()
-    except ValueError:
-        messagebox.showerror("Error", "Token endpoint returned invalid JSON.")
-        return
+    except ValueError as e:
+        raise USPSValidatorError("Token endpoint returned invalid JSON.") from e
+
+    if not token_json.get("access_token"):
+        raise USPSValidatorError(f"No access_token in response:\n{token_json}")
+
+    return token_json
+
+class TokenManager:
+    """
+    Keeps the USPS access token valid for the length of a run. The token and its
+    expiry are persisted in keyring. Once the token is within `refresh_margin`
+    seconds of expiring, the next caller kicks off a background refresh and keeps
+    using the old token meanwhile; an already-expired token is refreshed inline.
+    Concurrent callers share a single /token request. A failed background
+    refresh is not retried for `refresh_cooldown` seconds.
+    """
+
+    def __init__(self, refresh_margin=TOKEN_REFRESH_MARGIN, session=None, refresh_cooldown=TOKEN_REFRESH_COOLDOWN):
+        self.refresh_margin = refresh_margin
+        self.refresh_cooldown = refresh_cooldown
+        self.session = session
+        self.refreshes = 0
+        self._token = None
+        self._expires_at = None
+        self._lifetime = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        # Reentrant: get_token() holds it while it re-checks and then refreshes
+        self._refresh_lock = threading.RLock()
+        self._background = None
+        self._background_failed_at = None
+
+    def _load(self):
+        # Pick up whatever an earlier session left in keyring
+        if not self._loaded:
+            self._token = get_token()
+            self._expires_at = get_token_expiry()
+            self._loaded = True
+
+    def _margin(self):
+        # Short-lived tokens (e.g. from the mock server) refresh at half-life, not constantly
+        if self._lifetime:
+            return min(self.refresh_margin, self._lifetime / 2)
+        return self.refresh_margin
+
+    def peek(self):
+        """
+        Return the current token if it is still usable, else None. Starts a
+        background refresh when the token is close to expiring.
+        """
+        with self._lock:
+            self._load()
+            token, expires_at = self._token, self._expires_at
+        if not token:
+            return None
+        if expires_at is None:
+            # Unknown expiry (token stored by an older version): use it until a 401
+            return token
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            return None
+        if remaining <= self._margin():
+            self.refresh_in_background()
+        return token
+
+    def get_token(self):
+        """Return a usable access token, fetching a new one if needed."""
+        token = self.peek()
+        if token:
+            return token
+        with self._refresh_lock:
+            # Threads that queued here behind another refresh get its token
+            return self.peek() or self.refresh()
+
+    def refresh(self, stale_token=None):
+        """
+        Fetch and store a new token. If stale_token is given and another thread
+        has already replaced it, that newer token is returned instead of making
+        a second request.
+        """
+        with self._refresh_lock:
+            with self._lock:
+                self._load()
+                current = self._token
+                fresh = self._expires_at is None or self._expires_at - time.time() > self._margin()
+            if stale_token is not None and current and current != stale_token and fresh:
+                return current
+
+            token_json = request_oauth_token(self.session)
+            access_token = token_json["access_token"]
+            expires_at = None
+            lifetime = None
+            try:
+                lifetime = float(token_json.get("expires_in"))
+                expires_at = time.time() + lifetime
+            except (TypeError, ValueError):
+                pass
+
+            set_token(access_token)
+            if expires_at is not None:
+                set_token_expiry(expires_at)
+
+            with self._lock:
+                self._token = access_token
+                self._expires_at = expires_at
+                self._lifetime = lifetime
+                self.refreshes += 1
+            if _service_metrics is not None:
+                _service_metrics.count("token_refreshes")
+            return access_token
+
+    def refresh_in_background(self):
+        """
+        Start a refresh on a daemon thread unless one is already running or the
+        last one failed less than refresh_cooldown seconds ago.
+        """
+        with self._lock:
+            if self._background is not None and self._background.is_alive():
+                return
+            failed_at = self._background_failed_at
+            if failed_at is not None and time.monotonic() - failed_at < self.refresh_cooldown:
+                return
+            stale = self._token
+            self._background = threading.Thread(target=self._background_refresh, args=(stale,), daemon=True)
+            self._background.start()
+
+    def _background_refresh(self, stale_token):
+        try:
+            self.refresh(stale_token)
+        except USPSValidatorError:
+            # The foreground path will retry (and report) once the token actually expires
+            with self._lock:
+                self._background_failed_at = time.monotonic()
+        else:
+            with self._lock:
+                self._background_failed_at = None
+
+    def invalidate(self):
+        """Forget the in-memory token so the next get_token() re-reads keyring."""
+        invalidate_credential(TOKEN_KEY)
+        invalidate_credential(TOKEN_EXPIRES_KEY)
+        with self._lock:
+            self._token = None
+            self._expires_at = None
+            self._loaded = False
+
+_token_manager = None
+_token_manager_lock = threading.Lock()
+
+def get_token_manager():
+    """Return the process-wide TokenManager shared by all runs and workers."""
+    global _token_manager
+    with _token_manager_lock:
+        if _token_manager is None:
+            _token_manager = TokenManager()
+        return _token_manager
+
+def resolve_token(token):
+    """`token` may be a plain access-token string or a TokenManager."""
+    if isinstance(token, TokenManager):
+        return token.get_token()
+    return token
+
+def fetch_and_store_oauth_token():
+    """
+    GUI action: get a new OAuth token through the shared TokenManager (which
+    stores it and its expiry in keyring) and report the result.
+    """
+    from tkinter import messagebox
 
-    access_token = token_json.get("access_token")
-    if not access_token:
-        messagebox.showerror("Error", f"No access_token in response:\n{token_json}")
+    try:
+        access_token = get_token_manager().refresh()
+    except USPSValidatorError as e:
+        messagebox.showerror("Error", str(e))
         return
 
-    # Store the token in keyring
-    set_token(access_token)
     messagebox.showinfo("Success", f"Received OAuth token:\n{access_token[:60]}...")
 
+########################################################################
+# Validation Result Cache (SQLite, shared across threads and processes)
+########################################################################
+
+CACHE_EVICT_EVERY = 1000   # Check the size bound after this many writes
+CACHE_MAX_IDLE_CONNECTIONS = 16   # SQLite connections kept open between lookups
+
+def normalize_params(params):
+    """
+    Normalize a build_address_params dict so trivially different spellings of
+    the same address (case, extra whitespace, key order) share one cache entry.
+    """
+    return {key: " ".join(str(val).split()).upper() for key, val in sorted(params.items())}
+
+def params_cache_key(params, base_url=None):
+    """
+    SHA-256 of the normalized params. Cache entries also pass the API base URL,
+    so responses from the test environment or a mock never answer production
+    lookups.
+    """
+    normalized = json.dumps(normalize_params(params), sort_keys=True, separators=(",", ":"))
+    if base_url is not None:
+        normalized = f"{base_url}\n{normalized}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class ValidationCache:
+    """
+    On-disk cache of raw USPS /address JSON keyed by the normalized request
+    params and the API base URL in use at lookup time.
+    Entries expire after `ttl` seconds and the least recently used ones are evicted
+    once there are more than `max_entries`. Connections come from a small pool
+    (one per concurrent lookup, at most CACHE_MAX_IDLE_CONNECTIONS kept open
+    when idle), so short-lived worker threads do not leak them; WAL mode plus a
+    busy timeout lets parallel workers and separate processes share one file.
+    The cache is best-effort: SQLite errors are treated as misses rather than
+    failing the row.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_CACHE_TTL, max_entries=DEFAULT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._idle = []
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+    @contextlib.contextmanager
+    def _connection(self):
+        """Borrow a pooled connection for one operation; it goes back to the pool afterwards."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            # isolation_level=None -> autocommit; each statement is its own short transaction
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.Error:
+                conn.close()
+                raise
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                keep = len(self._idle) < CACHE_MAX_IDLE_CONNECTIONS
+                if keep:
+                    self._idle.append(conn)
+            if not keep:
+                conn.close()
+
+    def get(self, params):
+        """Return the cached USPS JSON (parsed) for these params, or None on a miss."""
+        key = params_cache_key(params, USPS_API_BASE_URL)
+        now = time.time()
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                response, created_at = row
+                if self.ttl and now - created_at > self.ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            return None
+
+        try:
+            return json.loads(response)
+        except ValueError:
+            return None
+
+    def put(self, params, raw_json):
+        """Store the raw USPS JSON text for these params."""
+        key = params_cache_key(params, USPS_API_BASE_URL)
+        now = time.time()
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at, last_access)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, raw_json, now, now),
+                )
+        except sqlite3.Error:
+            return
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % CACHE_EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries."""
+        try:
+            with self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if self.ttl:
+                        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+                    if self.max_entries:
+                        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+                        excess = count - self.max_entries
+                        if excess > 0:
+                            conn.execute(
+                                "DELETE FROM responses WHERE key IN ("
+                                " SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                                (excess,),
+                            )
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM responses")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Close the idle connections; the cache stays usable and reconnects on demand."""
+        with self._lock:
+            connections, self._idle = self._idle, []
+        for conn in connections:
+            conn.close()
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_cache(path=DEFAULT_CACHE_PATH):
+    """
+    Return the shared ValidationCache for path (None disables caching). The
+    default cache is skipped when the API base URL is not production, so test
+    and mock runs never fill it; pass another path to cache those.
+    """
+    if not path or (path == DEFAULT_CACHE_PATH and not using_production_api()):
+        return None
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = ValidationCache(path)
+            _caches[path] = cache
+        return cache
+
+########################################################################
+# Adaptive Rate Limiting (token bucket, 429 / Retry-After aware)
+########################################################################
+
+MIN_RATE_LIMIT = 0.5            # Never slow below this many requests/sec
+RATE_DECREASE_FACTOR = 0.5      # Multiply the rate by this on a 429
+RATE_DECREASE_COOLDOWN = 1.0    # Seconds between rate cuts, so one burst of 429s cuts once
+RATE_MAX_SLEEP = 0.25           # Waiters re-check the bucket at least this often
+RATE_INCREASE_AFTER = 20        # Clean responses needed before speeding up again
+RATE_INCREASE_FRACTION = 0.1    # Each step adds this fraction of the ceiling
+MAX_THROTTLE_REQUEUES = 10      # A row is requeued this many times on 429 before it fails
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+def parse_rate_limit_reset(headers):
+    """
+    Seconds until the server's rate-limit window resets when it reports no
+    remaining requests (X-RateLimit-* / RateLimit-* headers), else None.
+    """
+    remaining = headers.get("X-RateLimit-Remaining", headers.get("RateLimit-Remaining"))
+    reset = headers.get("X-RateLimit-Reset", headers.get("RateLimit-Reset"))
+    if remaining is None or reset is None:
+        return None
+    try:
+        remaining = float(remaining)
+        reset = float(reset)
+    except ValueError:
+        return None
+    if remaining > 0:
+        return None
+    # Some servers send an epoch timestamp, others a delay in seconds
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(0.0, reset)
+
+class RateLimiter:
+    """
+    Token bucket shared by all workers of a run. The fill rate starts at `rate`
+    (the ceiling), is cut on every 429 and creeps back up after a streak of clean
+    responses. Retry-After and exhausted rate-limit headers pause the whole
+    bucket until the server says it is safe to send again.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=None, min_rate=MIN_RATE_LIMIT):
+        self.max_rate = float(rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.capacity = float(burst) if burst else max(1.0, self.max_rate)
+        self.throttled = 0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._clean_streak = 0
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def _try_take(self):
+        """
+        Take a token if one is available and return 0, otherwise return how long
+        to sleep before checking again. Waiters re-check rather than reserving
+        ahead, so a rate change applies to everyone already queued.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return
+            time.sleep(min(wait, RATE_MAX_SLEEP))
+
+    async def acquire_async(self):
+        import asyncio
+
+        while True:
+            wait = self._try_take()
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, RATE_MAX_SLEEP))
+
+    def pause(self, seconds):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def on_throttle(self, retry_after=None):
+        """Called on HTTP 429: slow down and honor Retry-After if given."""
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            self._clean_streak = 0
+            # A burst of in-flight requests all bounce at once; count it as one signal
+            if now - self._last_decrease >= RATE_DECREASE_COOLDOWN:
+                self.rate = max(self.min_rate, self.rate * RATE_DECREASE_FACTOR)
+                self._last_decrease = now
+            self._tokens = min(self._tokens, 0.0)
+        if retry_after:
+            self.pause(retry_after)
+
+    def on_response(self, headers):
+        """Called on every non-429 response: note rate-limit headers and speed back up."""
+        reset = parse_rate_limit_reset(headers)
+        if reset:
+            self.pause(reset)
+        with self._lock:
+            self._clean_streak += 1
+            if self._clean_streak >= RATE_INCREASE_AFTER and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_INCREASE_FRACTION)
+                self._clean_streak = 0
+
+########################################################################
+# Retry Policy (exponential backoff with jitter)
+########################################################################
+
+RETRY_BASE_DELAY = 0.5                            # First backoff ceiling, in seconds
+RETRY_MAX_DELAY = 20.0                            # Backoff ceiling never grows past this
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+class RetryPolicy:
+    """
+    Decides whether a failed /address call is tried again and how long to wait.
+    Backoff is exponential with full jitter, capped by max_attempts per address
+    and by an overall per-address deadline.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, deadline=DEFAULT_ROW_DEADLINE,
+                 base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        self.max_attempts = max(1, int(max_attempts))
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def expired(self, started):
+        return bool(self.deadline) and time.monotonic() - started >= self.deadline
+
+    def delay(self, attempt, started, retry_after=None):
+        """
+        Seconds to sleep before attempt + 1, or None if the address should fail now
+        (out of attempts, or the wait would run past the deadline).
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after:
+            delay = max(delay, retry_after)
+        if self.deadline and time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay
+
+def is_retryable_exception(ex):
+    """Connection resets and timeouts are worth retrying; malformed requests are not."""
+    import requests
+
+    return isinstance(ex, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+def plan_retry(resp, attempt, requeues, started, rate_limiter=None, retry_policy=None):
+    """
+    Decide what to do with a /address response. Returns (delay, requeue):
+    delay is None when the response is final. requeue=True marks a 429 that was
+    handed back to the rate limiter, which does not use up a retry attempt.
+    """
+    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
+    if rate_limiter is not None:
+        if resp.status_code == 429:
+            rate_limiter.on_throttle(retry_after)
+            if requeues < MAX_THROTTLE_REQUEUES and not (retry_policy and retry_policy.expired(started)):
+                # The limiter already waits out Retry-After before handing out the next token
+                return 0.0, True
+        else:
+            rate_limiter.on_response(resp.headers)
+
+    if retry_policy is not None and resp.status_code in RETRYABLE_STATUS_CODES:
+        return retry_policy.delay(attempt, started, retry_after), False
+
+    return None, False
+
+########################################################################
+# Run Metrics (stage timings, request latency histogram, run report)
+########################################################################
+
+# Histogram bucket upper bounds in seconds: 1 ms to ~60 s, each 10% above the last,
+# so percentiles read off the histogram are within 10% of the true value
+LATENCY_BUCKETS = tuple(0.001 * 1.1 ** i for i in range(116))
+
+# Pipeline stages in the order a run goes through them
+RUN_STAGES = ["read", "normalize", "params", "network", "parse", "assemble", "write"]
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations (seconds). Thread-safe; memory does not grow with the count."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last bucket: above the largest bound
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100), interpolated within its bucket; None if empty."""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+            largest = self.max
+        if not total:
+            return None
+        rank = q / 100 * total
+        seen = 0
+        for index, n in enumerate(counts):
+            if n and seen + n >= rank:
+                low = self.bounds[index - 1] if index > 0 else 0.0
+                high = self.bounds[index] if index < len(self.bounds) else largest
+                return min(largest, low + (high - low) * max(0.0, rank - seen) / n)
+            seen += n
+        return largest
+
+    def nonzero_buckets(self):
+        """[(upper bound in seconds or None for overflow, count)] for buckets that were hit."""
+        with self._lock:
+            counts = list(self.counts)
+        return [(self.bounds[i] if i < len(self.bounds) else None, n) for i, n in enumerate(counts) if n]
+
+class RunMetrics:
+    """
+    Instrumentation for one run, shared by all workers: seconds per pipeline
+    stage (RUN_STAGES), a latency histogram of every USPS /address request,
+    counters (requests, retries, 429s, cache hits/misses, status classes) and
+    gauges (in-flight requests, queue depth). Stages timed on worker threads
+    ("parse") are summed across workers. Everything is also forwarded to the
+    process-wide ServiceMetrics while the metrics endpoint is running.
+    """
+
+    def __init__(self, latency_buckets=LATENCY_BUCKETS, parent=None):
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.gauges = {}
+        self.latency = LatencyHistogram(latency_buckets)
+        self.parent = parent if parent is not None else _service_metrics
+        self._lock = threading.Lock()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+        if self.parent is not None:
+            self.parent.count(name, n)
+
+    def gauge_add(self, name, delta):
+        with self._lock:
+            self.gauges[name] = self.gauges.get(name, 0) + delta
+        if self.parent is not None:
+            self.parent.gauge_add(name, delta)
+
+    def add_stage_time(self, stage, started):
+        """Add the time since `started` (a perf_counter() value) to `stage`."""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+        if self.parent is not None:
+            self.parent.add_stage_time(stage, started)
+
+    def observe_request(self, seconds, status=None):
+        """Record one HTTP attempt; status None means it failed without a response."""
+        self.latency.observe(seconds)
+        if self.parent is not None:
+            self.parent.latency.observe(seconds)
+        self.count("requests")
+        self.count("request_errors" if status is None else f"status_{status // 100}xx")
+        if status == 429:
+            self.count("status_429")
+
+    def report(self, stats=None, input_path=None, output_path=None):
+        """Summary dict for the JSON report sidecar."""
+        stats = dict(stats or {})
+        elapsed = time.perf_counter() - self.started
+        rows = stats.get("rows", 0)
+        counters = dict(self.counters)
+
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 2)
+
+        latency = self.latency
+        return {
+            "input": input_path,
+            "output": output_path,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started_at)),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows": rows,
+            "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+            "stats": stats,
+            "stages_seconds": {stage: round(self.stages.get(stage, 0.0), 4) for stage in RUN_STAGES},
+            "requests": {
+                "sent": counters.get("requests", 0),
+                "retries": counters.get("retries", 0),
+                "throttled_429": counters.get("status_429", 0),
+                "errors_without_response": counters.get("request_errors", 0),
+                "reauthorized_after_401": counters.get("reauthorized", 0),
+                "status_classes": {name[7:]: n for name, n in sorted(counters.items())
+                                   if name.startswith("status_") and name.endswith("xx")},
+            },
+            "cache": {"hits": counters.get("cache_hits", 0), "misses": counters.get("cache_misses", 0)},
+            "latency_ms": {
+                "count": latency.count,
+                "mean": ms(latency.sum / latency.count) if latency.count else None,
+                "p50": ms(latency.percentile(50)),
+                "p95": ms(latency.percentile(95)),
+                "p99": ms(latency.percentile(99)),
+                "max": ms(latency.max) if latency.count else None,
+            },
+            "latency_histogram_ms": [{"le": None if bound is None else ms(bound), "count": n}
+                                     for bound, n in latency.nonzero_buckets()],
+        }
+
+@contextlib.contextmanager
+def track_in_flight(metrics):
+    """Count the enclosed request in the "in_flight" gauge of `metrics` (may be None)."""
+    if metrics is None:
+        yield
+        return
+    metrics.gauge_add("in_flight", 1)
+    try:
+        yield
+    finally:
+        metrics.gauge_add("in_flight", -1)
+
+def report_path_for(output_path):
+    """<name>_validated.report.json next to the <name>_validated.<ext> output."""
+    return split_extension(output_path)[0] + ".report.json"
+
+def write_run_report(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    return path
+
+########################################################################
+# Metrics Endpoint (Prometheus text format, for long-running processes)
+########################################################################
+
+DEFAULT_METRICS_HOST = "127.0.0.1"   # Local only; expose it further behind a proxy if needed
+DEFAULT_METRICS_PORT = 9464
+
+# Coarse request-duration buckets (seconds) in the usual Prometheus style
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# counter name in RunMetrics -> (Prometheus name, help text)
+METRICS_COUNTERS = {
+    "requests": ("usps_validator_requests_total", "USPS /address requests sent, including retries."),
+    "request_errors": ("usps_validator_request_errors_total", "Requests that failed without an HTTP response."),
+    "status_429": ("usps_validator_throttled_total", "HTTP 429 responses."),
+    "retries": ("usps_validator_retries_total", "Requests retried or requeued after a transient failure."),
+    "cache_hits": ("usps_validator_cache_hits_total", "Addresses answered from the result cache."),
+    "cache_misses": ("usps_validator_cache_misses_total", "Addresses not found in the result cache."),
+    "reauthorized": ("usps_validator_reauthorized_total", "Requests retried with a new token after HTTP 401."),
+    "token_requests": ("usps_validator_token_requests_total", "OAuth /token requests sent."),
+    "token_errors": ("usps_validator_token_errors_total", "OAuth /token requests that failed."),
+    "token_refreshes": ("usps_validator_token_refreshes_total", "Access tokens fetched and stored."),
+    "rows": ("usps_validator_rows_total", "Input rows validated."),
+}
+METRICS_GAUGES = {
+    "in_flight": ("usps_validator_in_flight_requests", "USPS /address requests awaiting a response."),
+    "queue_depth": ("usps_validator_queue_depth", "Unique addresses handed to a lookup that have not finished."),
+}
+
+class ServiceMetrics(RunMetrics):
+    """Process-wide totals across all runs, served by start_metrics_server()."""
+
+    def __init__(self):
+        super().__init__(METRICS_LATENCY_BUCKETS)
+        self.parent = None
+
+    def render(self):
+        """The current values in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            stages = dict(self.stages)
+        lines = []
+        for name, (metric, help_text) in METRICS_COUNTERS.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter", f"{metric} {counters.get(name, 0)}"]
+
+        lines += ["# HELP usps_validator_responses_total HTTP responses by status class.",
+                  "# TYPE usps_validator_responses_total counter"]
+        for name, n in sorted(counters.items()):
+            if name.startswith("status_") and name.endswith("xx"):
+                lines.append(f'usps_validator_responses_total{{status_class="{name[7:]}"}} {n}')
+
+        for name, (metric, help_text) in METRICS_GAUGES.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge", f"{metric} {gauges.get(name, 0)}"]
+
+        lines += ["# HELP usps_validator_stage_seconds_total Seconds spent per pipeline stage.",
+                  "# TYPE usps_validator_stage_seconds_total counter"]
+        for stage in RUN_STAGES:
+            lines.append(f'usps_validator_stage_seconds_total{{stage="{stage}"}} {stages.get(stage, 0.0):.6f}')
+
+        latency = self.latency
+        with latency._lock:
+            counts = list(latency.counts)
+            total, total_seconds = latency.count, latency.sum
+        metric = "usps_validator_request_duration_seconds"
+        lines += [f"# HELP {metric} USPS /address request latency.", f"# TYPE {metric} histogram"]
+        cumulative = 0
+        for bound, n in zip(latency.bounds, counts):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines += [f'{metric}_bucket{{le="+Inf"}} {total}', f"{metric}_sum {total_seconds:.6f}",
+                  f"{metric}_count {total}"]
+        return "\n".join(lines) + "\n"
+
+_service_metrics = None
+
+def get_service_metrics():
+    """The process-wide ServiceMetrics, or None until start_metrics_server() is called."""
+    return _service_metrics
+
+def start_metrics_server(port=DEFAULT_METRICS_PORT, host=DEFAULT_METRICS_HOST):
+    """
+    Start collecting process-wide metrics and serve them at
+    http://<host>:<port>/metrics from a daemon thread. Returns the server;
+    call shutdown() on it to stop serving. port=0 picks a free port
+    (see server.server_address).
+    """
+    global _service_metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    if _service_metrics is None:
+        _service_metrics = ServiceMetrics()
+    metrics = _service_metrics
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes every few seconds would drown out everything else on stderr
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+########################################################################
+# Checkpoint Journal (resume interrupted runs)
+########################################################################
+
+def file_sha256(file_path, block_size=1 << 20):
+    """Hex SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ValidationJournal:
+    """
+    Append-only JSON-lines log of finished rows for one input file, named after
+    the file's SHA-256 and the API base URL (see journal_name) so an edited
+    file, or a run against another server, never resumes from a stale journal.
+    Each line maps a list of row indexes (0-based data rows of the input) to the
+    output fields they received. Writes are buffered and flushed to disk at most
+    `flush_interval` seconds after they happen. Rows that failed with a
+    ValidationError are not journaled, so a resumed run tries them again.
+    """
+
+    def __init__(self, path, flush_interval=DEFAULT_JOURNAL_FLUSH_INTERVAL, resume=True):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        self._completed = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self._last_flush = time.monotonic()
+
+    def _load(self):
+        with open(self.path, "rb+") as f:
+            complete = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn final line from a crash mid-write
+                    break
+                complete += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                fields = entry["fields"]
+                for row in entry["rows"]:
+                    self._completed[row] = fields
+            # Cut the fragment off so the next record does not get glued onto it
+            f.truncate(complete)
+
+    def __len__(self):
+        return len(self._completed)
+
+    def completed_rows(self, start, count):
+        """Finished rows in [start, start + count), as {position - start: fields}."""
+        if not self._completed:
+            return {}
+        return {row - start: self._completed[row] for row in range(start, start + count) if row in self._completed}
+
+    def record(self, rows, fields):
+        """Journal that these row indexes finished with `fields`. Thread-safe."""
+        if "ValidationError" in fields:
+            return
+        line = json.dumps({"rows": list(rows), "fields": fields}, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+            elif self._timer is None:
+                # Make sure a quiet spell after this write still gets it to disk
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_locked(self):
+        if self._dirty and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._timer = None
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._flush_locked()
+            self._file.close()
+
+    def discard(self):
+        """Close and delete the journal (after the output file is safely written)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+def journal_name(file_path):
+    """<sha256>.jsonl for the file's contents plus the API base URL in use."""
+    digest = hashlib.sha256(f"{USPS_API_BASE_URL}\n{file_sha256(file_path)}".encode("utf-8")).hexdigest()
+    return f"{digest}.jsonl"
+
+def open_journal(file_path, journal_dir=DEFAULT_JOURNAL_DIR, flush_interval=DEFAULT_JOURNAL_FLUSH_INTERVAL,
+                 resume=True):
+    """
+    Open the checkpoint journal for file_path (None if journal_dir is None).
+    With resume=False any earlier journal for the same file is started over.
+    """
+    if not journal_dir:
+        return None
+    path = os.path.join(journal_dir, journal_name(file_path))
+    return ValidationJournal(path, flush_interval=flush_interval, resume=resume)
+
 ########################################################################
 # Address Validation Logic
 ########################################################################
 
-def clean_zip(val):
+ZIP_COLUMNS = ["ZIPCode", "ZIPPlus4"]
+
+def is_missing(value):
+    """
+    pd.isna for a single value (None, NaN, pd.NA, NaT), without importing
+    pandas: its own missing types can only exist once it is loaded.
+    """
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return math.isnan(value)
+    if isinstance(value, (str, int)):
+        return False
+    pd = sys.modules.get("pandas")
+    if pd is None:
+        return False
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        # Not a scalar (list, array): never a missing cell
+        return False
+
+def clean_zip(val, width=5):
     """
-    Convert numeric or string ZIP codes to a proper digit string, 
-    removing any .0 if present.
+    Convert numeric or string ZIP codes to a proper digit string,
+    removing any .0 if present and restoring leading zeros that were
+    lost to numeric storage (907 -> 00907; use width=4 for ZIPPlus4).
     """
-    if pd.isna(val):
+    # Already clean (e.g. after normalize_zip_columns)
+    if type(val) is str and len(val) == width and val.isdigit():
+        return val
+    if is_missing(val):
         return ""
     # If it's numeric, convert to an int then string
-    if isinstance(val, (int, float)):
-        return str(int(val))  # e.g. 63146.0 -> 63146
-    # Otherwise, it's a string—strip whitespace
-    s = str(val).strip()
-    # Possibly remove .0 if present
-    if s.endswith(".0"):
-        s = s[:-2]
+    if isinstance(val, float) and not val.is_integer():
+        # 907.5, inf: not a ZIP; pass it through rather than truncate it
+        s = str(val)
+    elif isinstance(val, (int, float)):
+        s = str(int(val))  # e.g. 63146.0 -> 63146
+    else:
+        # Otherwise, it's a string—strip whitespace
+        s = str(val).strip()
+        # Possibly remove .0 if present
+        if s.endswith(".0"):
+            s = s[:-2]
+    if s.isdigit():
+        s = s.zfill(width)
     return s
 
+def normalize_zip_series(series, width):
+    """
+    Vectorized clean_zip for a whole column. Returns (zips, plus4): zips holds
+    zero-padded digit strings (missing values become NaN), plus4 holds the part
+    after the dash for combined "12345-6789" values in a ZIPCode column (width
+    5) and is NaN elsewhere. In a ZIPPlus4 column (width 4) a combined value is
+    replaced by its +4 part. Numbers that are not whole, or too large to be a
+    ZIP, are passed through as text rather than truncated.
+    """
+    import pandas as pd
+
+    missing = series.isna()
+    plus4 = pd.Series(float("nan"), index=series.index, dtype=object)
+
+    if pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        text = series.astype(str)
+    elif pd.api.types.is_float_dtype(series.dtype):
+        # e.g. 907.0 -> "907"; padded below
+        whole = (series % 1 == 0) & (series.abs() < 10 ** 15)
+        text = series.where(whole, 0).astype("int64").astype(str)
+        passed_through = ~whole & ~missing
+        if passed_through.any():
+            text[passed_through] = series[passed_through].astype(str)
+    else:
+        text = series.astype(str).str.strip()
+        point_zero = text.str.endswith(".0")
+        if point_zero.any():
+            text = text.where(~point_zero, text.str.slice(0, -2))
+
+        has_dash = text.str.contains("-", regex=False) & ~missing
+        if has_dash.any():
+            dashed = text[has_dash]
+            # Two regex replaces stay vectorized where str.split(expand=True) loops in Python
+            head = dashed.str.replace(r"\s*-.*$", "", regex=True)
+            tail = dashed.str.replace(r"^[^-]*-\s*", "", regex=True)
+            combined = head.str.isdigit() & tail.str.isdigit()
+            text = text.copy()
+            if width == 4:
+                # A full ZIP+4 typed into the ZIPPlus4 column: keep the +4
+                text[combined[combined].index] = tail[combined]
+            else:
+                text[combined[combined].index] = head[combined]
+                plus4[combined[combined].index] = tail[combined].str.pad(4, side="left", fillchar="0")
+
+    # pad is a single vectorized kernel; equivalent to zfill for digit-only values
+    digits = text.str.isdigit()
+    text = text.where(~digits, text.str.pad(width, side="left", fillchar="0"))
+
+    empty = missing | (text == "")
+    zips = text.astype(object).where(~empty, float("nan"))
+    return zips, plus4
+
+def normalize_zip_columns(df):
+    """
+    Clean ZIPCode and ZIPPlus4 for the whole frame in one vectorized pass before
+    dispatch: zero-pad to 5 and 4 digits, drop stray ".0" and split combined
+    ZIP+4 values ("12345-6789") into both columns. Returns a new frame; other
+    columns are shared, not copied.
+    """
+    if not any(name in df.columns for name in ZIP_COLUMNS):
+        return df
+
+    updates = {}
+    combined_plus4 = None
+    if "ZIPCode" in df.columns:
+        updates["ZIPCode"], combined_plus4 = normalize_zip_series(df["ZIPCode"], 5)
+    if "ZIPPlus4" in df.columns:
+        plus4, _ = normalize_zip_series(df["ZIPPlus4"], 4)
+        if combined_plus4 is not None:
+            plus4 = plus4.where(plus4.notna(), combined_plus4)
+        updates["ZIPPlus4"] = plus4
+    elif combined_plus4 is not None and combined_plus4.notna().any():
+        updates["ZIPPlus4"] = combined_plus4
+    return df.assign(**updates)
+
+def is_blank(value):
+    """True for None, NaN and empty or whitespace-only strings."""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    return is_missing(value)
+
 def build_address_params(row_dict):
     street_address = row_dict.get("streetAddress", "")
     state = row_dict.get("state", "")
     city  = row_dict.get("city", "")
+    # Empty cells come through as NaN, which is truthy
+    street_address = "" if is_blank(street_address) else street_address
+    state = "" if is_blank(state) else state
+    city = "" if is_blank(city) else city
     
     # Force numeric ZIP fields to digit strings
     zip_code = clean_zip(row_dict.get("ZIPCode", ""))
-    zip_plus4 = clean_zip(row_dict.get("ZIPPlus4", ""))
+    zip_plus4 = clean_zip(row_dict.get("ZIPPlus4", ""), 4)
+    if "-" in zip_plus4:
+        # A full "12345-6789" in the ZIPPlus4 cell: only the +4 belongs here
+        zip_plus4 = clean_zip(zip_plus4.partition("-")[2], 4)
+
+    # ZIP+4 typed into one cell, e.g. "12345-6789"
+    if "-" in zip_code:
+        zip_code, _, combined_plus4 = zip_code.partition("-")
+        zip_code = clean_zip(zip_code)
+        if not zip_plus4:
+            zip_plus4 = clean_zip(combined_plus4, 4)
 
     # Must have streetAddress and state
     if not street_address or not state:
@@ -139,58 +1385,91 @@ def build_address_params(row_dict):
     if zip_code:
         params["ZIPCode"] = zip_code
 
-    # Optional fields
-    if "firm" in row_dict and row_dict["firm"]:
+    # Optional fields (blank cells are NaN, which must not be sent as "nan")
+    if not is_blank(row_dict.get("firm")):
         params["firm"] = row_dict["firm"]
-    if "secondaryAddress" in row_dict and row_dict["secondaryAddress"]:
+    if not is_blank(row_dict.get("secondaryAddress")):
         params["secondaryAddress"] = row_dict["secondaryAddress"]
     if zip_plus4:  # only if not empty
         params["ZIPPlus4"] = zip_plus4
-    if "urbanization" in row_dict and row_dict["urbanization"]:
+    if not is_blank(row_dict.get("urbanization")):
         params["urbanization"] = row_dict["urbanization"]
 
     return params
 
-def validate_address(row_dict, token):
+MISSING_FIELDS_ERROR = "Missing required fields (streetAddress/state/city-or-ZIPCode)"
+CANCELLED_ERROR = "Cancelled before validation"
+
+def column_present(df, name):
+    """Vectorized `not is_blank(value)` for one column; all False if the column is absent."""
+    import pandas as pd
+
+    if name not in df.columns:
+        return pd.Series(False, index=df.index)
+    col = df[name]
+    present = col.notna()
+    if not pd.api.types.is_numeric_dtype(col.dtype) and present.any():
+        present &= col.astype(str).str.strip() != ""
+    return present
+
+def viable_rows_mask(df):
     """
-    Call USPS /address endpoint. The row_dict may contain extra ID fields that
-    we simply carry through to the final output.
+    Boolean Series, True for rows that have streetAddress, state and city or
+    ZIPCode (the rules build_address_params enforces), computed with column
+    masks instead of row by row. Expects ZIP columns already normalized.
     """
-    params = build_address_params(row_dict)
-    if not params:
-        # The row is missing required fields
-        return {
-            **row_dict,
-            "ValidationError": "Missing required fields (streetAddress/state/city-or-ZIPCode)"
-        }
+    return (
+        column_present(df, "streetAddress")
+        & column_present(df, "state")
+        & (column_present(df, "city") | column_present(df, "ZIPCode"))
+    )
+
+ID_COLUMNS = ["RecordID", "CustomerID", "OtherID"]
+
+# Every column validation can add, in the order map_usps_response produces them
+OUTPUT_COLUMNS = [
+    "Warnings",
+    "Standardized_Firm",
+    "Standardized_StreetAddress",
+    "Standardized_StreetAddressAbbrev",
+    "Standardized_SecondaryAddress",
+    "Standardized_City",
+    "Standardized_CityAbbrev",
+    "Standardized_State",
+    "Standardized_ZIPCode",
+    "Standardized_ZIPPlus4",
+    "Standardized_Urbanization",
+    "DeliveryPoint",
+    "CarrierRoute",
+    "DPVConfirmation",
+    "DPVCMRA",
+    "Business",
+    "CentralDeliveryPoint",
+    "Vacant",
+    "ValidationError",
+]
 
-    headers = {
+def build_request_headers(token):
+    return {
         "Authorization": f"Bearer {token}",
         "Accept": "application/json",
     }
 
-    try:
-        resp = requests.get(USPS_ENDPOINT, params=params, headers=headers, timeout=10)
-    except requests.RequestException as ex:
-        return {**row_dict, "ValidationError": f"RequestException: {str(ex)}"}
+def map_usps_response(data):
+    """
+    Turn a parsed USPS /address JSON payload into the output columns
+    (Warnings, Standardized_* and the additionalInfo fields).
+    """
+    fields = {}
 
-    if resp.status_code != 200:
-        return {**row_dict, "ValidationError": f"HTTP {resp.status_code}: {resp.text}"}
-
-    # Parse JSON
-    try:
-        data = resp.json()
-    except ValueError:
-        return {**row_dict, "ValidationError": "Invalid JSON in response"}
-
-    # Check for warnings or corrections
-    if "warnings" in data and isinstance(data["warnings"], list):
-        row_dict["Warnings"] = "; ".join(data["warnings"])
+    # Check for warnings or corrections
+    if "warnings" in data and isinstance(data["warnings"], list):
+        fields["Warnings"] = "; ".join(data["warnings"])
 
     address_data = data.get("address", {})
 
     # Build standardized fields
-    standardized_fields = {
+    fields.update({
         "Standardized_Firm": data.get("firm", ""),
         "Standardized_StreetAddress": address_data.get("streetAddress", ""),
         "Standardized_StreetAddressAbbrev": address_data.get("streetAddressAbbreviation", ""),
@@ -201,12 +1480,12 @@ def validate_address(row_dict, token):
         "Standardized_ZIPCode": address_data.get("ZIPCode", ""),
         "Standardized_ZIPPlus4": address_data.get("ZIPPlus4", ""),
         "Standardized_Urbanization": address_data.get("urbanization", ""),
-    }
+    })
 
     # Additional info
     additional = data.get("additionalInfo", {})
     if additional:
-        standardized_fields.update({
+        fields.update({
             "DeliveryPoint": additional.get("deliveryPoint", ""),
             "CarrierRoute": additional.get("carrierRoute", ""),
             "DPVConfirmation": additional.get("DPVConfirmation", ""),
@@ -216,50 +1495,1611 @@ def validate_address(row_dict, token):
             "Vacant": additional.get("vacant", ""),
         })
 
-    return {**row_dict, **standardized_fields}
+    return fields
+
+def fetch_address_fields(params, token, session=None, cache=None, rate_limiter=None, retry_policy=None,
+                         metrics=None):
+    """
+    Look up one build_address_params dict. Returns the output columns for it:
+    the standardized fields, or a ValidationError. Uses the shared keep-alive
+    session unless one is passed in, and checks `cache` (a ValidationCache)
+    before going to the network. With a RateLimiter, requests wait for a token
+    and a 429 requeues the address instead of failing it; with a RetryPolicy,
+    transient errors (resets, timeouts, 429/502/503/504) are retried with backoff.
+    `token` may be a TokenManager, in which case a 401 is retried exactly once
+    with a freshly fetched token. A RunMetrics records every attempt (default:
+    the process-wide ServiceMetrics, if the metrics endpoint is running).
+    """
+    import requests
+
+    if metrics is None:
+        metrics = _service_metrics
+    if cache is not None:
+        cached = cache.get(params)
+        if metrics is not None:
+            metrics.count("cache_misses" if cached is None else "cache_hits")
+        if cached is not None:
+            return map_usps_response(cached)
+
+    session = session or get_session()
+
+    started = time.monotonic()
+    attempt = 0
+    requeues = 0
+    reauthorized = False
+    while True:
+        # Wait for a rate-limit slot first so the token is current when the request goes out
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        attempt += 1
+
+        try:
+            access_token = resolve_token(token)
+        except USPSValidatorError as ex:
+            return {"ValidationError": f"Token refresh failed: {ex}"}
+        headers = build_request_headers(access_token)
+
+        sent = time.perf_counter()
+        try:
+            with track_in_flight(metrics):
+                resp = session.get(USPS_ENDPOINT, params=params, headers=headers, timeout=10)
+        except requests.RequestException as ex:
+            if metrics is not None:
+                metrics.observe_request(time.perf_counter() - sent)
+            delay = None
+            if retry_policy is not None and is_retryable_exception(ex):
+                delay = retry_policy.delay(attempt, started)
+            if delay is None:
+                return {"ValidationError": f"RequestException: {str(ex)}"}
+            if metrics is not None:
+                metrics.count("retries")
+            time.sleep(delay)
+            continue
+        if metrics is not None:
+            metrics.observe_request(time.perf_counter() - sent, resp.status_code)
+
+        if resp.status_code == 401 and isinstance(token, TokenManager) and not reauthorized:
+            reauthorized = True
+            attempt -= 1
+            try:
+                token.refresh(stale_token=access_token)
+            except USPSValidatorError as ex:
+                return {"ValidationError": f"Token refresh failed: {ex}"}
+            if metrics is not None:
+                metrics.count("reauthorized")
+            continue
+
+        delay, requeue = plan_retry(resp, attempt, requeues, started, rate_limiter, retry_policy)
+        if delay is None:
+            break
+        if requeue:
+            requeues += 1
+            attempt -= 1
+        if metrics is not None:
+            metrics.count("retries")
+        time.sleep(delay)
+
+    if resp.status_code != 200:
+        return {"ValidationError": f"HTTP {resp.status_code}: {resp.text}"}
+
+    # Parse JSON
+    parse_started = time.perf_counter()
+    try:
+        data = resp.json()
+    except ValueError:
+        return {"ValidationError": "Invalid JSON in response"}
+
+    if cache is not None:
+        cache.put(params, resp.text)
+
+    fields = map_usps_response(data)
+    if metrics is not None:
+        metrics.add_stage_time("parse", parse_started)
+    return fields
+
+def validate_address(row_dict, token, session=None, cache=None, rate_limiter=None, retry_policy=None,
+                     metrics=None):
+    """
+    Call USPS /address endpoint. The row_dict may contain extra ID fields that
+    we simply carry through to the final output.
+    """
+    params = build_address_params(row_dict)
+    if not params:
+        # The row is missing required fields
+        return {**row_dict, "ValidationError": MISSING_FIELDS_ERROR}
+
+    fields = fetch_address_fields(params, token, session, cache, rate_limiter, retry_policy, metrics)
+    return {**row_dict, **fields}
+
+########################################################################
+# Unique Address Lookups
+########################################################################
+
+def add_stats(total, stats):
+    """Accumulate one chunk's dedup counts into a running total."""
+    for name, value in stats.items():
+        total[name] = total.get(name, 0) + value
+    return total
+
+def dedup_stats(keys, unique_params):
+    valid_rows = len(keys) - list(keys).count(None)
+    return {
+        "rows": len(keys),
+        "missing_fields": len(keys) - valid_rows,
+        "unique_addresses": len(unique_params),
+        "requests_saved": valid_rows - len(unique_params),
+    }
+
+def format_run_summary(stats):
+    summary = (
+        f"{stats['rows']} rows, {stats['unique_addresses']} unique addresses "
+        f"({stats['requests_saved']} duplicate requests saved)"
+    )
+    if stats.get("rows_resumed"):
+        summary += f"\n{stats['rows_resumed']} rows resumed from an earlier interrupted run"
+    if stats.get("failed_rows"):
+        summary += f"\n{stats['failed_rows']} rows could not be validated (see ValidationError)"
+    if stats.get("cancelled_rows"):
+        summary += f"\n{stats['cancelled_rows']} rows skipped after cancelling; run the file again to finish them"
+    if stats.get("report_path"):
+        summary += f"\nRun report: {stats['report_path']}"
+    return summary
+
+def lookup_unique_addresses(unique_params, token, max_workers=DEFAULT_MAX_WORKERS, cache=None,
+                            rate_limiter=None, retry_policy=None, on_result=None, cancelled=None, metrics=None,
+                            session=None):
+    """
+    Run fetch_address_fields for every entry of unique_params (address key ->
+    params) on up to max_workers threads. Returns address key -> fields.
+    on_result(key, fields), if given, is called from the worker as each
+    address finishes. Once cancelled() returns True no new requests are sent:
+    requests already in flight finish and the rest get CANCELLED_ERROR.
+    Uses the shared session unless one is passed in.
+    """
+    if session is None:
+        # Size the keep-alive pool to match the number of workers
+        session = get_session(max(1, max_workers))
+    if metrics is None:
+        metrics = _service_metrics
+    pending = [len(unique_params)]
+    pending_lock = threading.Lock()
+
+    def lookup(item):
+        key, params = item
+        try:
+            if cancelled is not None and cancelled():
+                fields = {"ValidationError": CANCELLED_ERROR}
+            else:
+                fields = fetch_address_fields(params, token, session, cache, rate_limiter, retry_policy, metrics)
+        finally:
+            if metrics is not None:
+                with pending_lock:
+                    pending[0] -= 1
+                metrics.gauge_add("queue_depth", -1)
+        if on_result is not None:
+            on_result(key, fields)
+        return fields
+
+    started = time.perf_counter()
+    if metrics is not None:
+        metrics.gauge_add("queue_depth", len(unique_params))
+    try:
+        if max_workers <= 1 or len(unique_params) <= 1:
+            fields = [lookup(item) for item in unique_params.items()]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # executor.map yields in submission order, so fields line up with unique_params
+                fields = list(executor.map(lookup, unique_params.items()))
+    finally:
+        if metrics is not None:
+            # Addresses never started (Ctrl+C, errors) leave the queue too
+            metrics.gauge_add("queue_depth", -pending[0])
+            metrics.add_stage_time("network", started)
+    return dict(zip(unique_params, fields))
+
+########################################################################
+# Columnar DataFrame Path
+########################################################################
+
+def prepare_frame(df, metrics=None):
+    """
+    Pre-flight pass over a freshly read frame: normalize the ZIP columns, mark
+    rows missing required fields and group the rest by address. Identical
+    address columns are grouped with groupby().ngroup(), so params and a cache
+    key are built once per distinct address rather than once per row. Returns
+    (df, keys, unique_params) with df the normalized frame, keys an object
+    array where keys[i] is the address key of row i (None if it is missing
+    required fields) and unique_params mapping each key to the params of the
+    first row that produced it. ID columns never reach the params, so rows
+    that differ only in RecordID/CustomerID/OtherID share a key.
+    """
+    import numpy as np
+
+    started = time.perf_counter()
+    df = normalize_zip_columns(df)
+    viable = viable_rows_mask(df).to_numpy(dtype=bool)
+    if metrics is not None:
+        metrics.add_stage_time("normalize", started)
+
+    started = time.perf_counter()
+    columns = [name for name in ADDRESS_COLUMNS if name in df.columns]
+
+    keys = np.full(len(df), None, dtype=object)
+    unique_params = {}
+    if viable.any():
+        address = df.loc[viable, columns]
+        # One code per distinct address, numbered in order of first appearance
+        codes = address.groupby(columns, dropna=False, sort=False).ngroup().to_numpy()
+        first_rows = np.unique(codes, return_index=True)[1]
+        group_keys = np.full(len(first_rows), None, dtype=object)
+        for code, values in enumerate(address.iloc[first_rows].itertuples(index=False, name=None)):
+            params = build_address_params(dict(zip(columns, values)))
+            if not params:
+                continue
+            key = params_cache_key(params)
+            group_keys[code] = key
+            unique_params.setdefault(key, params)
+        keys[viable] = group_keys[codes]
+    if metrics is not None:
+        metrics.add_stage_time("params", started)
+    return df, keys, unique_params
+
+def output_columns_frame(index, keys, fields_by_key, resumed=None, present_only=False):
+    """
+    Vectorized fan-out: a DataFrame with the OUTPUT_COLUMNS columns and one
+    row per entry of keys (placed on `index`). Each unique address's fields
+    are laid out once and repeated onto its rows with a single take(), so no
+    per-row dicts or lists are built. `resumed` maps row positions to fields
+    taken from a checkpoint journal instead of fields_by_key. With
+    present_only, only the columns some row actually received are kept.
+    """
+    import numpy as np
+    import pandas as pd
+
+    records = list(fields_by_key.values())
+    codes = pd.Index(list(fields_by_key), dtype=object).get_indexer(keys)
+    missing = codes < 0
+    if resumed:
+        # Journal entries share one fields dict across their rows; lay each out once
+        record_codes = {}
+        for position, fields in resumed.items():
+            code = record_codes.get(id(fields))
+            if code is None:
+                code = record_codes[id(fields)] = len(records)
+                records.append(fields)
+            codes[position] = code
+            missing[position] = False
+    if missing.any():
+        # Rows without a key (missing required fields) point at one error record
+        codes[missing] = len(records)
+        records.append({"ValidationError": MISSING_FIELDS_ERROR})
+
+    columns = OUTPUT_COLUMNS
+    if present_only:
+        present = set().union(*records)
+        columns = [name for name in OUTPUT_COLUMNS if name in present]
+    unique = pd.DataFrame.from_records(records, columns=columns) if records else pd.DataFrame(columns=columns)
+    result = unique.take(np.asarray(codes, dtype=np.intp))
+    result.index = index
+    return result
+
+def join_output_columns(df, output):
+    """
+    Attach the ID columns (if missing) and the output_columns_frame columns to
+    df by index. Pass-through columns are shared with df, never copied row by
+    row. An input column that validation also produces keeps its value on rows
+    where validation left it empty.
+    """
+    added = {name: "" for name in ID_COLUMNS if name not in df.columns}
+    for name in output.columns:
+        values = output[name]
+        if name in df.columns:
+            values = values.where(values.notna(), df[name])
+        added[name] = values
+    return df.assign(**added)
+
+def validate_frame(df, token, max_workers=DEFAULT_MAX_WORKERS, cache=None, stats=None,
+                   rate_limiter=None, retry_policy=None, journal=None, row_offset=0, progress=None,
+                   metrics=None, session=None):
+    """
+    Validate every row of a DataFrame and return it with the output columns
+    joined on (same index and row order), sending one request per unique
+    address and dispatching up to max_workers requests at once. If `stats` is
+    a dict it is filled with the dedup counts (see dedup_stats). `rate_limiter`
+    is shared by all workers.
+    With a ValidationJournal, rows it already holds are filled from it instead
+    of the network and newly finished rows are journaled as they complete;
+    row_offset is the file row index of df's first row. A RunProgress is
+    advanced as rows finish, a RunMetrics collects stage times and request metrics.
+    """
+    import pandas as pd
+
+    df, keys, unique_params = prepare_frame(df, metrics)
+    if stats is not None:
+        stats.update(dedup_stats(keys, unique_params))
+    if metrics is not None:
+        metrics.count("rows", len(keys))
+
+    resumed = journal.completed_rows(row_offset, len(keys)) if journal is not None else {}
+    pending = pd.notna(keys)
+    if resumed:
+        pending[list(resumed)] = False
+    positions = pending.nonzero()[0]
+    # File row indexes of every still-pending row, grouped by address key
+    rows_by_key = {key: rows.tolist() for key, rows in
+                   pd.Index(positions + row_offset).groupby(pd.Index(keys[positions], dtype=object)).items()}
+    unique_params = {key: params for key, params in unique_params.items() if key in rows_by_key}
+    if stats is not None and journal is not None:
+        stats["rows_resumed"] = len(resumed)
+    if progress is not None:
+        # Rows missing required fields and resumed rows are already done
+        progress.advance(len(keys) - sum(len(rows) for rows in rows_by_key.values()))
+
+    def on_result(key, fields):
+        rows = rows_by_key[key]
+        if journal is not None:
+            journal.record(rows, fields)
+        if progress is not None:
+            failed = "ValidationError" in fields and fields["ValidationError"] != CANCELLED_ERROR
+            progress.advance(len(rows), failed=len(rows) if failed else 0)
+
+    cancelled = progress.cancel_requested.is_set if progress is not None else None
+    fields_by_key = lookup_unique_addresses(unique_params, token, max_workers, cache, rate_limiter, retry_policy,
+                                            on_result, cancelled, metrics, session)
+    if stats is not None:
+        errors = [(fields["ValidationError"], len(rows_by_key[key]))
+                  for key, fields in fields_by_key.items() if "ValidationError" in fields]
+        stats["failed_rows"] = sum(n for error, n in errors if error != CANCELLED_ERROR)
+        stats["cancelled_rows"] = sum(n for error, n in errors if error == CANCELLED_ERROR)
+
+    started = time.perf_counter()
+    result = join_output_columns(df, output_columns_frame(df.index, keys, fields_by_key, resumed,
+                                                          present_only=True))
+    if metrics is not None:
+        metrics.add_stage_time("assemble", started)
+    return result
+
+def frame_to_row_dicts(df):
+    """One dict per row of df, with None instead of NaN for empty cells."""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+def validate_rows(row_dicts, token, max_workers=DEFAULT_MAX_WORKERS, cache=None, stats=None,
+                  rate_limiter=None, retry_policy=None, metrics=None):
+    """
+    Row-dict wrapper around validate_frame for callers that are not holding a
+    DataFrame. Returns one dict per row, in order, with the output columns
+    added (None where a row got no value).
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(list(row_dicts), dtype=object)
+    return frame_to_row_dicts(validate_frame(df, token, max_workers, cache, stats, rate_limiter, retry_policy,
+                                             metrics=metrics))
+
+########################################################################
+# AddressValidator (reusable engine for services, the CLI and the GUI)
+########################################################################
+
+class AddressValidator:
+    """
+    Validation engine that owns everything a run needs: an HTTP session, the
+    token (a TokenManager, default the shared keyring-backed one, or a plain
+    access-token string), the result cache, the rate limiter and the retry
+    policy. It never shows dialogs: lookup failures come back as a
+    ValidationError field on the result, setup problems raise USPSValidatorError.
+
+    `cache` is a cache file path, a ValidationCache or None (no caching).
+    Without a `session` it opens its own, closed by close() or by using the
+    validator as a context manager. Safe to share between threads.
+
+        with AddressValidator(max_workers=16) as validator:
+            result = validator.validate_one({"streetAddress": "...", "state": "NC", "city": "..."})
+    """
+
+    def __init__(self, token=None, max_workers=DEFAULT_MAX_WORKERS, cache=DEFAULT_CACHE_PATH,
+                 rate_limit=DEFAULT_RATE_LIMIT, max_attempts=DEFAULT_MAX_ATTEMPTS, session=None, metrics=None):
+        self.token = token if token is not None else get_token_manager()
+        self.max_workers = max(1, max_workers)
+        if cache is None or isinstance(cache, ValidationCache):
+            self.cache = cache
+        else:
+            try:
+                self.cache = get_cache(cache)
+            except (OSError, sqlite3.Error) as e:
+                raise USPSValidatorError(f"Could not open the validation cache:\n{e}") from e
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.retry_policy = RetryPolicy(max_attempts)
+        self.metrics = metrics
+        self._owns_session = session is None
+        self.session = new_session(self.max_workers) if session is None else session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the session if the validator opened it."""
+        if self._owns_session:
+            self.session.close()
+
+    def check_token(self):
+        """Make sure a usable access token is available; raises USPSValidatorError if not."""
+        if isinstance(self.token, TokenManager):
+            try:
+                self.token.get_token()
+            except USPSValidatorError as e:
+                raise USPSValidatorError(f"No usable USPS OAuth token. Please get one first.\n{e}") from e
+        elif not self.token:
+            raise USPSValidatorError("No USPS OAuth token found. Please get one first.")
+
+    def lookup(self, params):
+        """The output fields for one build_address_params dict (cache first, then USPS)."""
+        return fetch_address_fields(params, self.token, self.session, self.cache, self.rate_limiter,
+                                    self.retry_policy, self.metrics)
+
+    def validate_one(self, row):
+        """
+        Validate one address given as a row dict (streetAddress, state, city,
+        ZIPCode, ...). Returns the row with the output columns added, as
+        validate_address does; failures are in its ValidationError field.
+        """
+        params = build_address_params(row)
+        if not params:
+            return {**row, "ValidationError": MISSING_FIELDS_ERROR}
+        return {**row, **self.lookup(params)}
+
+    def validate_many(self, rows):
+        """
+        Validate an iterable of row dicts on max_workers threads, yielding
+        (index, result) pairs as lookups complete, so not in input order; index
+        is the row's position in `rows`. The iterable is consumed lazily, with at
+        most 2 * max_workers lookups queued; rows repeating an address share one
+        request. Closing the generator early cancels the queued lookups.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {}          # future -> address key
+        waiting = {}          # address key -> [(index, row)] sharing that lookup
+        fields_by_key = {}    # finished lookups, for later repeats of the address
+
+        def finished(block):
+            done, _ = wait(futures, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = futures.pop(future)
+                fields = fields_by_key[key] = future.result()
+                for index, row in waiting.pop(key):
+                    yield index, {**row, **fields}
+
+        try:
+            for index, row in enumerate(rows):
+                params = build_address_params(row)
+                if not params:
+                    yield index, {**row, "ValidationError": MISSING_FIELDS_ERROR}
+                    continue
+                key = params_cache_key(params)
+                if key in fields_by_key:
+                    yield index, {**row, **fields_by_key[key]}
+                    continue
+                if key in waiting:
+                    waiting[key].append((index, row))
+                    continue
+                waiting[key] = [(index, row)]
+                futures[executor.submit(self.lookup, params)] = key
+                yield from finished(block=len(futures) >= 2 * self.max_workers)
+            while futures:
+                yield from finished(block=True)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def validate_dataframe(self, df, stats=None, journal=None, row_offset=0, progress=None, metrics=None):
+        """
+        Validate every row of a DataFrame and return it with the output columns
+        joined on (same index and row order); see validate_frame for the
+        journal, row_offset and progress arguments.
+        """
+        return validate_frame(df, self.token, max_workers=self.max_workers, cache=self.cache, stats=stats,
+                              rate_limiter=self.rate_limiter, retry_policy=self.retry_policy, journal=journal,
+                              row_offset=row_offset, progress=progress, metrics=metrics or self.metrics,
+                              session=self.session)
+
+    def validate_columns(self, df, stats=None):
+        """
+        Validate every row of a DataFrame and return only the output columns
+        (all of OUTPUT_COLUMNS) as a new DataFrame on df's index. df itself is
+        neither modified nor copied. Backs the df.usps accessor.
+        """
+        _, keys, unique_params = prepare_frame(df, self.metrics)
+        if stats is not None:
+            stats.update(dedup_stats(keys, unique_params))
+        fields_by_key = lookup_unique_addresses(unique_params, self.token, self.max_workers, self.cache,
+                                                self.rate_limiter, self.retry_policy, metrics=self.metrics,
+                                                session=self.session)
+        started = time.perf_counter()
+        result = output_columns_frame(df.index, keys, fields_by_key)
+        if self.metrics is not None:
+            self.metrics.add_stage_time("assemble", started)
+        return result
+
+########################################################################
+# pandas Accessor (df.usps)
+########################################################################
+
+class USPSAccessor:
+    """
+    Registered on pandas DataFrames as `df.usps`:
+
+        validated = df.usps.validate(concurrency=16, cache=None)
+
+    `import usps_pandas` registers it in any import order. Importing this
+    module after pandas registers it too.
+    """
+
+    def __init__(self, df):
+        self._df = df
+
+    def validate(self, concurrency=DEFAULT_MAX_WORKERS, cache=DEFAULT_CACHE_PATH, rate_limit=DEFAULT_RATE_LIMIT,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, token=None, validator=None, stats=None):
+        """
+        Validate the frame's address columns and return a new DataFrame: the
+        original columns followed by the output columns (Standardized_*,
+        DPV flags, Warnings, ValidationError), aligned on the original index.
+        Input columns are returned as they were (ZIP codes are only normalized
+        for the request). Uses `validator` (an AddressValidator) if given,
+        otherwise a temporary one built from the other arguments. Raises
+        USPSValidatorError if there is no usable token or the cache cannot be
+        opened; lookup failures are reported in ValidationError.
+        """
+        if validator is None:
+            with AddressValidator(token=token, max_workers=concurrency, cache=cache, rate_limit=rate_limit,
+                                  max_attempts=max_attempts) as own_validator:
+                return self.validate(validator=own_validator, stats=stats)
+        validator.check_token()
+        columns = validator.validate_columns(self._df, stats)
+        return self._df.assign(**{name: columns[name].to_numpy() for name in OUTPUT_COLUMNS})
+
+_accessor_registered = False
+
+def register_accessor():
+    """Register USPSAccessor as df.usps (imports pandas; safe to call more than once)."""
+    global _accessor_registered
+    import pandas as pd
+
+    if not _accessor_registered:
+        _accessor_registered = True
+        pd.api.extensions.register_dataframe_accessor("usps")(USPSAccessor)
+
+# Importing this module never pulls in pandas itself, but if it is already loaded df.usps is ready to use
+if "pandas" in sys.modules:
+    register_accessor()
 
 ########################################################################
 # Main Processing
 ########################################################################
 
-def process_file(file_path):
-    token = get_token()
-    if not token:
-        messagebox.showerror("Error", "No USPS OAuth token found. Please get one first.")
+# Output formats the CLI can convert to, by extension
+OUTPUT_FORMATS = {"xlsx": ".xlsx", "csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+
+def validated_output_path(file_path, output_format=None):
+    """
+    <name>_validated.<ext>, keeping the input's extension unless output_format
+    (an OUTPUT_FORMATS key) is given. Excel output is always written as .xlsx,
+    so .xlsm and .xls inputs get a .xlsx output.
+    """
+    base, ext = split_extension(file_path)
+    if output_format is not None:
+        ext = OUTPUT_FORMATS[output_format]
+    elif ext.lower() in (".xlsm", ".xls"):
+        ext = ".xlsx"
+    return f"{base}_validated{ext}"
+
+class RunProgress:
+    """
+    Thread-safe progress counters for one run: rows done, rows whose lookup
+    failed, throughput and ETA. `total` is None when the row count is not known
+    up front (e.g. streamed CSV). on_update(progress), if given, is called after
+    every change from whichever thread made it. cancel() asks the run to stop
+    sending requests; it still finishes and writes partial output.
+    """
+
+    def __init__(self, on_update=None):
+        self.on_update = on_update
+        self.total = None
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.cancel_requested = threading.Event()
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self.cancel_requested.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_requested.is_set()
+
+    def start(self, total=None):
+        with self._lock:
+            self.total = total
+            self.started = time.monotonic()
+        self._notify()
+
+    def advance(self, rows, failed=0):
+        if not rows:
+            return
+        with self._lock:
+            self.done += rows
+            self.failed += failed
+        self._notify()
+
+    def _notify(self):
+        if self.on_update is not None:
+            self.on_update(self)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Seconds left at the current rate, or None if unknown."""
+        rate = self.rows_per_second
+        if self.total is None or rate <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / rate)
+
+def validate_file(file_path, output_path=None, max_workers=DEFAULT_MAX_WORKERS, cache_path=DEFAULT_CACHE_PATH,
+                  rate_limit=DEFAULT_RATE_LIMIT, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                  streaming=None, chunk_size=STREAM_CHUNK_SIZE, columns=None,
+                  resume=True, journal_dir=DEFAULT_JOURNAL_DIR,
+                  journal_flush_interval=DEFAULT_JOURNAL_FLUSH_INTERVAL, progress=None, metrics=None,
+                  report=True, validator=None):
+    """
+    Validate every row of an Excel, CSV (.csv / .csv.gz) or Parquet file and save
+    the result to output_path (default <name>_validated.<ext> next to it, in the
+    same format; the output extension picks the format). With streaming=True the
+    file is read, validated and written chunk_size rows at a time so memory stays
+    flat regardless of file size; the default streams CSV and Parquet, and
+    Excel workbooks of more than EXCEL_STREAMING_THRESHOLD rows (so the GUI,
+    which never picks, stays flat on big sheets too). `columns` limits which pass-through columns are read (address and ID
+    columns are always kept).
+
+    Finished rows are journaled under journal_dir (flushed every
+    journal_flush_interval seconds) until the output is saved. If a run is
+    interrupted, running the same file again skips the rows already done;
+    pass resume=False to start over, or journal_dir=None to disable journaling.
+
+    `progress` is an optional RunProgress; cancelling it stops new requests
+    and saves the output with the remaining rows marked CANCELLED_ERROR (the
+    journal is kept so running the file again finishes them).
+
+    Stage timings, request latencies, retries and cache hits are collected in
+    `metrics` (a new RunMetrics unless one is passed) and, with report=True,
+    written to <name>_validated.report.json next to the output; its path is
+    stats["report_path"].
+
+    Lookups go through `validator` (an AddressValidator); by default one is
+    built from max_workers, cache_path, rate_limit and max_attempts on the
+    shared session.
+
+    Returns (output_path, stats); raises USPSValidatorError on failure. Never
+    touches the GUI, so it is safe for scripts and the command line.
+    """
+    fmt = detect_file_format(file_path)
+    label = FORMAT_LABELS[fmt]
+    if not os.path.isfile(file_path):
+        raise USPSValidatorError(f"File not found: {file_path}")
+    if streaming is None:
+        streaming = fmt != "excel" or (count_input_rows(file_path) or 0) > EXCEL_STREAMING_THRESHOLD
+    output_path = output_path or validated_output_path(file_path)
+    output_label = FORMAT_LABELS[detect_file_format(output_path)]
+
+    if validator is None:
+        # The shared session keeps connections alive across files
+        validator = AddressValidator(max_workers=max_workers, cache=cache_path, rate_limit=rate_limit,
+                                     max_attempts=max_attempts, session=get_session(max(1, max_workers)))
+    validator.check_token()
+
+    try:
+        journal = open_journal(file_path, journal_dir, journal_flush_interval, resume)
+    except OSError as e:
+        raise USPSValidatorError(f"Could not open the checkpoint journal:\n{e}") from e
+
+    stats = {}
+    metrics = metrics or RunMetrics()
+
+    def validate_chunk(df, chunk_stats, row_offset=0):
+        # Validate unique addresses concurrently; order is preserved
+        return validator.validate_dataframe(df, stats=chunk_stats, journal=journal, row_offset=row_offset,
+                                            progress=progress, metrics=metrics)
+
+    saved = False
+    try:
+        if streaming:
+            if progress is not None:
+                progress.start(count_input_rows(file_path))
+            stream_validate_file(file_path, output_path, validate_chunk, chunk_size=chunk_size, stats=stats,
+                                 columns=columns, metrics=metrics)
+        else:
+            # Read the whole file
+            started = time.perf_counter()
+            try:
+                df = read_input_frame(file_path, columns)
+            except USPSValidatorError:
+                raise
+            except Exception as e:
+                raise USPSValidatorError(f"Could not read the {label} file:\n{e}") from e
+            metrics.add_stage_time("read", started)
+
+            if progress is not None:
+                progress.start(len(df))
+            results = validate_chunk(df, stats)
+
+            # Save through the constant-memory writer
+            started = time.perf_counter()
+            try:
+                write_validated_frame(output_path, results, file_path)
+            except USPSValidatorError:
+                raise
+            except Exception as e:
+                raise USPSValidatorError(f"Failed to save {output_label} file:\n{e}") from e
+            metrics.add_stage_time("write", started)
+        saved = True
+    finally:
+        if journal is not None:
+            if saved and not (progress is not None and progress.cancelled):
+                # Output is safely written; the journal has served its purpose
+                journal.discard()
+            else:
+                # Keep it so the next run resumes
+                journal.close()
+
+    if report:
+        report_path = report_path_for(output_path)
+        try:
+            write_run_report(metrics.report(stats, file_path, output_path), report_path)
+            stats["report_path"] = report_path
+        except OSError:
+            # The validated file is what matters; a missing report is not worth failing the run
+            pass
+    return output_path, stats
+
+def process_file(file_path, **options):
+    """
+    GUI wrapper around validate_file (same keyword options): reports the
+    outcome in a messagebox instead of raising.
+    """
+    from tkinter import messagebox
+
+    try:
+        output_path, stats = validate_file(file_path, **options)
+    except USPSValidatorError as e:
+        messagebox.showerror("Error", str(e))
+        return
+
+    messagebox.showinfo("Success", f"Validated file saved as:\n{output_path}\n\n{format_run_summary(stats)}")
+
+########################################################################
+# File Formats & Streaming I/O (Excel, CSV, gzip-CSV, Parquet)
+########################################################################
+
+FORMAT_LABELS = {"excel": "Excel", "csv": "CSV", "parquet": "Parquet"}
+
+INPUT_FILETYPES = [
+    ("Address files", "*.xlsx *.xls *.csv *.csv.gz *.parquet"),
+    ("Excel files", "*.xlsx *.xls"),
+    ("CSV files", "*.csv *.csv.gz"),
+    ("Parquet files", "*.parquet"),
+]
+
+# Input columns build_address_params reads; always loaded even when `columns` narrows the read
+ADDRESS_COLUMNS = ["firm", "streetAddress", "secondaryAddress", "city", "state", "ZIPCode", "ZIPPlus4",
+                   "urbanization"]
+
+def split_extension(file_path):
+    """os.path.splitext, but compound extensions such as .csv.gz stay together."""
+    if file_path.lower().endswith(".csv.gz"):
+        return file_path[:-7], file_path[-7:]
+    return os.path.splitext(file_path)
+
+def detect_file_format(file_path):
+    """Return "excel", "csv" or "parquet" based on the file extension."""
+    ext = split_extension(file_path)[1].lower()
+    if ext in (".xlsx", ".xlsm", ".xls"):
+        return "excel"
+    if ext in (".csv", ".csv.gz"):
+        return "csv"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    raise USPSValidatorError(f"Unsupported file type: {file_path}\nUse .xlsx, .csv, .csv.gz or .parquet.")
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise USPSValidatorError(
+            "Parquet files need pyarrow. Install it with: uv sync --extra parquet"
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+def column_filter(columns):
+    """
+    Turn an optional list of pass-through columns into a usecols-style callable
+    that also keeps every address and ID column. None means read everything.
+    """
+    if columns is None:
+        return None
+    wanted = set(columns) | set(ADDRESS_COLUMNS) | set(ID_COLUMNS)
+    return lambda name: name in wanted
+
+def read_input_frame(file_path, columns=None):
+    """Read a whole input file (any supported format) into a DataFrame."""
+    import pandas as pd
+
+    fmt = detect_file_format(file_path)
+    usecols = column_filter(columns)
+    if fmt == "excel":
+        return pd.read_excel(file_path, engine="openpyxl", usecols=usecols)
+    if fmt == "csv":
+        # dtype=str keeps ZIP codes like 00907 intact
+        return pd.read_csv(file_path, dtype=str, usecols=usecols)
+    _, pq = _require_pyarrow()
+    names = pq.read_schema(file_path).names
+    selected = names if usecols is None else [name for name in names if usecols(name)]
+    return pq.read_table(file_path, columns=selected).to_pandas()
+
+def count_input_rows(file_path):
+    """
+    Number of data rows, when it can be known without reading the file: exact
+    for Parquet (footer metadata), the sheet's recorded dimensions for Excel
+    (may include trailing blank rows), None for CSV.
+    """
+    fmt = detect_file_format(file_path)
+    try:
+        if fmt == "parquet":
+            _, pq = _require_pyarrow()
+            return pq.ParquetFile(file_path).metadata.num_rows
+        if fmt == "excel":
+            import openpyxl
+
+            wb = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                max_row = wb.active.max_row
+            finally:
+                wb.close()
+            return max(0, max_row - 1) if max_row else None
+    except Exception:
+        return None
+    return None
+
+def iter_input_chunks(file_path, chunk_size=STREAM_CHUNK_SIZE, columns=None):
+    """
+    Yield the input as DataFrames of up to chunk_size rows, in file order. Excel
+    goes through a read-only worksheet, CSV through pandas' chunked reader and
+    Parquet through record batches that only read the selected columns.
+    """
+    fmt = detect_file_format(file_path)
+    usecols = column_filter(columns)
+
+    if fmt == "excel":
+        yield from iter_excel_chunks(file_path, chunk_size, usecols)
+        return
+
+    if fmt == "csv":
+        import pandas as pd
+
+        emitted = False
+        with pd.read_csv(file_path, dtype=str, usecols=usecols, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                emitted = True
+                yield chunk
+        if not emitted:
+            yield pd.read_csv(file_path, dtype=str, usecols=usecols, nrows=0)
         return
 
-    # Read the Excel
+    _, pq = _require_pyarrow()
+    parquet_file = pq.ParquetFile(file_path)
+    names = parquet_file.schema_arrow.names
+    selected = names if usecols is None else [name for name in names if usecols(name)]
+    emitted = False
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=selected):
+        emitted = True
+        yield batch.to_pandas()
+    if not emitted:
+        yield parquet_file.schema_arrow.empty_table().select(selected).to_pandas()
+
+def dedup_column_names(names):
+    """
+    Rename repeated header names the way pd.read_excel/read_csv do: the second
+    "city" becomes "city.1", skipping suffixes another column already uses.
+    """
+    names = list(names)
+    taken = set(names)
+    counts = {}
+    for i, name in enumerate(names):
+        count = counts.get(name, 0)
+        original = name
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in taken else counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+def iter_excel_chunks(file_path, chunk_size=STREAM_CHUNK_SIZE, usecols=None):
+    """
+    Yield the first worksheet as DataFrames of up to chunk_size rows, reading
+    through a read-only openpyxl workbook so the sheet is never fully loaded.
+    Blank rows inside the data are kept (so rows still line up with the sheet)
+    but trailing blank rows are dropped, as pd.read_excel does. A sheet with a
+    header and no data yields a single empty DataFrame carrying the columns.
+    """
+    import openpyxl
+    import pandas as pd
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
     try:
-        df = pd.read_excel(file_path, engine="openpyxl")
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        all_columns = dedup_column_names(
+            [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)])
+        keep = [i for i, name in enumerate(all_columns) if usecols is None or usecols(name)]
+        columns = [all_columns[i] for i in keep]
+        width = len(all_columns)
+
+        chunk = []
+        blank_run = []
+        emitted = False
+        for values in rows:
+            values = tuple(values[:width]) + (None,) * (width - len(values))
+            values = tuple(values[i] for i in keep)
+            if all(value is None for value in values):
+                blank_run.append(values)
+                continue
+            if blank_run:
+                chunk.extend(blank_run)
+                blank_run = []
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns)
+                emitted = True
+                chunk = []
+
+        if chunk or not emitted:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        wb.close()
+
+def streaming_output_columns(input_columns):
+    """Output layout for streamed runs: input columns, missing ID columns, then OUTPUT_COLUMNS."""
+    columns = list(input_columns)
+    for name in ID_COLUMNS + OUTPUT_COLUMNS:
+        if name not in columns:
+            columns.append(name)
+    return columns
+
+def cell_value(value):
+    """
+    Convert a pandas/numpy value into a plain Python value (None for missing),
+    as to_excel would. Excel has no infinity, so +/-inf become the strings
+    "inf"/"-inf" (to_excel's default inf_rep).
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and not math.isfinite(value):
+        return None if math.isnan(value) else ("inf" if value > 0 else "-inf")
+    # Called per cell, so skip the import statement; frames imply pandas is loaded
+    pd = sys.modules.get("pandas")
+    if pd is not None and (value is pd.NaT or value is pd.NA):
+        return None
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        # numpy scalar -> Python scalar
+        value = value.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None if math.isnan(value) else ("inf" if value > 0 else "-inf")
+    return value
+
+class ExcelRowWriter:
+    """
+    Append rows to a new .xlsx without ever holding the sheet in memory. Uses
+    xlsxwriter's constant_memory mode when it is installed (noticeably faster),
+    otherwise openpyxl's write-only mode. Frames must be written in row order.
+    """
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.rows_written = 0
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+
+        if xlsxwriter is not None:
+            self._wb = xlsxwriter.Workbook(path, {
+                "constant_memory": True,
+                "strings_to_urls": False,
+                "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            })
+            self._ws = self._wb.add_worksheet()
+            self._append = self._append_xlsxwriter
+        else:
+            import openpyxl
+
+            self._wb = openpyxl.Workbook(write_only=True)
+            self._ws = self._wb.create_sheet()
+            self._append = self._ws.append
+        self._next_row = 0
+        self._append(self.columns)
+
+    def _append_xlsxwriter(self, values):
+        self._ws.write_row(self._next_row, 0, values)
+        self._next_row += 1
+
+    def write_frame(self, frame):
+        append = self._append
+        for values in frame.reindex(columns=self.columns).itertuples(index=False, name=None):
+            append([cell_value(value) for value in values])
+        self.rows_written += len(frame)
+
+    def close(self):
+        if self._append == self._append_xlsxwriter:
+            self._wb.close()
+        else:
+            # openpyxl write-only workbook
+            self._wb.save(self.path)
+
+class CsvRowWriter:
+    """Append rows to a .csv file, gzip-compressed when the path ends in .gz."""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.rows_written = 0
+        if path.lower().endswith(".gz"):
+            self._file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write_frame(self, frame):
+        # csv.writer wrote the header, so match its \r\n line endings
+        frame.reindex(columns=self.columns).to_csv(self._file, header=False, index=False, lineterminator="\r\n")
+        self.rows_written += len(frame)
+
+    def close(self):
+        self._file.close()
+
+class ParquetRowWriter:
+    """
+    Append rows to a .parquet file, one row group per write_frame call. Columns
+    that came from the input keep their Parquet types; added columns are strings.
+    """
+
+    def __init__(self, path, columns, input_schema=None):
+        pa, pq = _require_pyarrow()
+        self._pa = pa
+        self.path = path
+        self.columns = list(columns)
+        self.rows_written = 0
+
+        fields = []
+        self._added = set()
+        for name in self.columns:
+            # ZIP columns are always strings after normalize_zip_columns
+            if input_schema is not None and name in input_schema.names and name not in ZIP_COLUMNS:
+                fields.append(input_schema.field(name))
+            else:
+                fields.append(pa.field(name, pa.string()))
+                self._added.add(name)
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_frame(self, frame):
+        if not len(frame):
+            return
+        frame = frame.reindex(columns=self.columns)
+        arrays = []
+        for field in self._schema:
+            values = frame[field.name]
+            if field.name in self._added:
+                values = values.astype("string")
+            arrays.append(self._pa.array(values, type=field.type, from_pandas=True))
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        self.rows_written += len(frame)
+
+    def close(self):
+        self._writer.close()
+
+def open_output_writer(output_path, columns, input_path):
+    """
+    Pick the row writer matching output_path's extension. Parquet output keeps
+    the column types of a Parquet input; from other inputs every column is a string.
+    """
+    fmt = detect_file_format(output_path)
+    if fmt == "excel":
+        return ExcelRowWriter(output_path, columns)
+    if fmt == "csv":
+        return CsvRowWriter(output_path, columns)
+    _, pq = _require_pyarrow()
+    input_schema = pq.read_schema(input_path) if detect_file_format(input_path) == "parquet" else None
+    return ParquetRowWriter(output_path, columns, input_schema)
+
+def write_validated_frame(output_path, frame, input_path):
+    """Write a validated DataFrame to output_path in one go through the matching row writer."""
+    writer = open_output_writer(output_path, frame.columns, input_path)
+    try:
+        writer.write_frame(frame)
+    finally:
+        writer.close()
+    return writer.rows_written
+
+def stream_validate_file(file_path, output_path, validate_chunk, chunk_size=STREAM_CHUNK_SIZE, stats=None,
+                         columns=None, metrics=None):
+    """
+    Read file_path chunk by chunk, run validate_chunk(df, chunk_stats, row_offset)
+    on each chunk's DataFrame (row_offset being the file row index of its first
+    row) and append the results to output_path as they come back. Only
+    one chunk of rows is held in memory at a time. Raises USPSValidatorError if
+    the input cannot be read or the output cannot be saved. Time spent reading
+    and writing is added to `metrics` (a RunMetrics) when given.
+    """
+    if stats is None:
+        stats = {}
+    if metrics is None:
+        metrics = RunMetrics()
+    label = FORMAT_LABELS[detect_file_format(file_path)]
+    output_label = FORMAT_LABELS[detect_file_format(output_path)]
+    writer = None
+    row_offset = 0
+    chunks = iter_input_chunks(file_path, chunk_size, columns)
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                df = next(chunks, None)
+            except USPSValidatorError:
+                raise
+            except Exception as e:
+                raise USPSValidatorError(f"Could not read the {label} file:\n{e}") from e
+            metrics.add_stage_time("read", started)
+            if df is None:
+                break
+
+            chunk_stats = {}
+            results = validate_chunk(df, chunk_stats, row_offset)
+            row_offset += len(df)
+            add_stats(stats, chunk_stats)
+
+            started = time.perf_counter()
+            try:
+                if writer is None:
+                    writer = open_output_writer(output_path, streaming_output_columns(df.columns), file_path)
+                writer.write_frame(results)
+            except USPSValidatorError:
+                raise
+            except Exception as e:
+                raise USPSValidatorError(f"Failed to save {output_label} file:\n{e}") from e
+            metrics.add_stage_time("write", started)
+    except BaseException:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        raise
+
+    if writer is None:
+        raise USPSValidatorError(f"Could not read the {label} file:\n{file_path} has no header row.")
+    started = time.perf_counter()
+    try:
+        writer.close()
     except Exception as e:
-        messagebox.showerror("Error", f"Could not read the Excel file:\n{e}")
-        return
+        raise USPSValidatorError(f"Failed to save {output_label} file:\n{e}") from e
+    metrics.add_stage_time("write", started)
+    return writer.rows_written
+
+########################################################################
+# Asyncio Processing (optional, requires httpx)
+########################################################################
+
+DEFAULT_ASYNC_CONCURRENCY = 200   # In-flight /address requests per event loop
+
+def _require_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "The asyncio pipeline needs httpx. Install it with: uv sync --extra async"
+        ) from e
+    return httpx
+
+async def fetch_address_fields_async(params, token, client, semaphore=None, cache=None, rate_limiter=None,
+                                     retry_policy=None, metrics=None):
+    """
+    Async twin of fetch_address_fields. `client` is an httpx.AsyncClient; the
+    optional semaphore caps how many requests are in flight at once. `token`
+    may be a string or a TokenManager, as in the sync path.
+    """
+    import asyncio
+
+    httpx = _require_httpx()
+    if metrics is None:
+        metrics = _service_metrics
+
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, params)
+        if metrics is not None:
+            metrics.count("cache_misses" if cached is None else "cache_hits")
+        if cached is not None:
+            return map_usps_response(cached)
+
+    retryable_errors = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+    started = time.monotonic()
+    attempt = 0
+    requeues = 0
+    reauthorized = False
+    while True:
+        if rate_limiter is not None:
+            await rate_limiter.acquire_async()
+        attempt += 1
+
+        try:
+            if isinstance(token, TokenManager):
+                # Refreshing blocks on the network, so only hop to a thread when needed
+                access_token = token.peek() or await asyncio.to_thread(token.get_token)
+            else:
+                access_token = token
+        except USPSValidatorError as ex:
+            return {"ValidationError": f"Token refresh failed: {ex}"}
+        headers = build_request_headers(access_token)
+
+        try:
+            if semaphore is not None:
+                async with semaphore:
+                    sent = time.perf_counter()
+                    with track_in_flight(metrics):
+                        resp = await client.get(USPS_ENDPOINT, params=params, headers=headers, timeout=10)
+            else:
+                sent = time.perf_counter()
+                with track_in_flight(metrics):
+                    resp = await client.get(USPS_ENDPOINT, params=params, headers=headers, timeout=10)
+        except httpx.HTTPError as ex:
+            if metrics is not None:
+                metrics.observe_request(time.perf_counter() - sent)
+            delay = None
+            if retry_policy is not None and isinstance(ex, retryable_errors):
+                delay = retry_policy.delay(attempt, started)
+            if delay is None:
+                return {"ValidationError": f"RequestException: {str(ex)}"}
+            if metrics is not None:
+                metrics.count("retries")
+            await asyncio.sleep(delay)
+            continue
+        if metrics is not None:
+            metrics.observe_request(time.perf_counter() - sent, resp.status_code)
+
+        if resp.status_code == 401 and isinstance(token, TokenManager) and not reauthorized:
+            reauthorized = True
+            attempt -= 1
+            try:
+                await asyncio.to_thread(token.refresh, access_token)
+            except USPSValidatorError as ex:
+                return {"ValidationError": f"Token refresh failed: {ex}"}
+            if metrics is not None:
+                metrics.count("reauthorized")
+            continue
+
+        delay, requeue = plan_retry(resp, attempt, requeues, started, rate_limiter, retry_policy)
+        if delay is None:
+            break
+        if requeue:
+            requeues += 1
+            attempt -= 1
+        if metrics is not None:
+            metrics.count("retries")
+        await asyncio.sleep(delay)
+
+    if resp.status_code != 200:
+        return {"ValidationError": f"HTTP {resp.status_code}: {resp.text}"}
+
+    parse_started = time.perf_counter()
+    try:
+        data = resp.json()
+    except ValueError:
+        return {"ValidationError": "Invalid JSON in response"}
+    fields = map_usps_response(data)
+    if metrics is not None:
+        metrics.add_stage_time("parse", parse_started)
+
+    if cache is not None:
+        await asyncio.to_thread(cache.put, params, resp.text)
+
+    return fields
 
-    # Validate row-by-row
-    results = []
-    for _, row in df.iterrows():
-        row_dict = row.to_dict()
+async def validate_address_async(row_dict, token, client, semaphore=None, cache=None, rate_limiter=None,
+                                 retry_policy=None):
+    """Async twin of validate_address."""
+    params = build_address_params(row_dict)
+    if not params:
+        return {**row_dict, "ValidationError": MISSING_FIELDS_ERROR}
+
+    fields = await fetch_address_fields_async(params, token, client, semaphore, cache, rate_limiter, retry_policy)
+    return {**row_dict, **fields}
+
+async def lookup_unique_addresses_async(unique_params, token, max_concurrency=DEFAULT_ASYNC_CONCURRENCY,
+                                        client=None, cache=None, rate_limiter=None, retry_policy=None,
+                                        metrics=None):
+    """Async twin of lookup_unique_addresses. Returns address key -> fields."""
+    import asyncio
+
+    httpx = _require_httpx()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    if metrics is None:
+        metrics = _service_metrics
+    pending = [len(unique_params)]
+
+    async def lookup(http_client, params):
+        try:
+            return await fetch_address_fields_async(params, token, http_client, semaphore, cache, rate_limiter,
+                                                    retry_policy, metrics)
+        finally:
+            if metrics is not None:
+                pending[0] -= 1
+                metrics.gauge_add("queue_depth", -1)
+
+    async def lookup_all(http_client):
+        return await asyncio.gather(*(lookup(http_client, params) for params in unique_params.values()))
+
+    started = time.perf_counter()
+    if metrics is not None:
+        metrics.gauge_add("queue_depth", len(unique_params))
+    try:
+        if client is not None:
+            fields = await lookup_all(client)
+        else:
+            limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+            async with httpx.AsyncClient(limits=limits) as own_client:
+                fields = await lookup_all(own_client)
+    finally:
+        if metrics is not None:
+            metrics.gauge_add("queue_depth", -pending[0])
+            metrics.add_stage_time("network", started)
+    return dict(zip(unique_params, fields))
+
+async def validate_frame_async(df, token, max_concurrency=DEFAULT_ASYNC_CONCURRENCY, client=None, cache=None,
+                               stats=None, rate_limiter=None, retry_policy=None, metrics=None):
+    """Async twin of validate_frame."""
+    import asyncio
 
-        # Optionally ensure ID fields exist
-        row_dict.setdefault("RecordID", "")
-        row_dict.setdefault("CustomerID", "")
-        row_dict.setdefault("OtherID", "")
+    df, keys, unique_params = await asyncio.to_thread(prepare_frame, df, metrics)
+    if stats is not None:
+        stats.update(dedup_stats(keys, unique_params))
+    if metrics is not None:
+        metrics.count("rows", len(keys))
+    fields_by_key = await lookup_unique_addresses_async(unique_params, token, max_concurrency, client, cache,
+                                                        rate_limiter, retry_policy, metrics)
+    started = time.perf_counter()
+    output = await asyncio.to_thread(output_columns_frame, df.index, keys, fields_by_key, None, True)
+    result = await asyncio.to_thread(join_output_columns, df, output)
+    if metrics is not None:
+        metrics.add_stage_time("assemble", started)
+    return result
 
-        validated = validate_address(row_dict, token)
-        results.append(validated)
+async def validate_rows_async(row_dicts, token, max_concurrency=DEFAULT_ASYNC_CONCURRENCY, client=None,
+                              cache=None, stats=None, rate_limiter=None, retry_policy=None):
+    """Async twin of validate_rows (a row-dict wrapper around validate_frame_async)."""
+    import pandas as pd
 
-    out_df = pd.DataFrame(results)
+    df = pd.DataFrame(list(row_dicts), dtype=object)
+    result = await validate_frame_async(df, token, max_concurrency, client, cache, stats, rate_limiter,
+                                        retry_policy)
+    return frame_to_row_dicts(result)
 
-    # Save
-    base, ext = os.path.splitext(file_path)
-    output_path = f"{base}_validated{ext}"
+async def process_file_async(file_path, token=None, max_concurrency=DEFAULT_ASYNC_CONCURRENCY,
+                             cache_path=DEFAULT_CACHE_PATH, rate_limit=DEFAULT_RATE_LIMIT,
+                             max_attempts=DEFAULT_MAX_ATTEMPTS, columns=None, report=True):
+    """
+    Async twin of process_file for use inside other asyncio services. Blocking
+    work (keyring, file I/O) runs in a worker thread so the caller's loop stays
+    responsive. `token` may be a string or a TokenManager (default: the shared
+    one). Writes the same run report as validate_file unless report=False.
+    Returns the output path; raises USPSValidatorError on failure.
+    """
+    import asyncio
+
+    metrics = RunMetrics()
+    if token is None:
+        token = get_token_manager()
+    if isinstance(token, TokenManager):
+        await asyncio.to_thread(token.get_token)
+    elif not token:
+        raise USPSValidatorError("No USPS OAuth token found. Please get one first.")
+
+    label = FORMAT_LABELS[detect_file_format(file_path)]
+    started = time.perf_counter()
     try:
-        out_df.to_excel(output_path, index=False)
+        df = await asyncio.to_thread(read_input_frame, file_path, columns)
+    except USPSValidatorError:
+        raise
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to save Excel file:\n{e}")
-        return
+        raise USPSValidatorError(f"Could not read the {label} file:\n{e}") from e
+    metrics.add_stage_time("read", started)
 
-    messagebox.showinfo("Success", f"Validated file saved as:\n{output_path}")
+    try:
+        cache = await asyncio.to_thread(get_cache, cache_path)
+    except (OSError, sqlite3.Error) as e:
+        raise USPSValidatorError(f"Could not open the validation cache:\n{e}") from e
+
+    rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+    retry_policy = RetryPolicy(max_attempts)
+    stats = {}
+    results = await validate_frame_async(df, token, max_concurrency=max_concurrency, cache=cache, stats=stats,
+                                         rate_limiter=rate_limiter, retry_policy=retry_policy, metrics=metrics)
+
+    output_path = validated_output_path(file_path)
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(write_validated_frame, output_path, results, file_path)
+    except Exception as e:
+        raise USPSValidatorError(f"Failed to save {label} file:\n{e}") from e
+    metrics.add_stage_time("write", started)
+
+    if report:
+        try:
+            await asyncio.to_thread(write_run_report, metrics.report(stats, file_path, output_path),
+                                    report_path_for(output_path))
+        except OSError:
+            pass
+    return output_path
+
+########################################################################
+# Command-Line Interface (headless; never imports tkinter)
+########################################################################
+
+# Exit codes of cli_main
+EXIT_OK = 0            # Every file validated and saved
+EXIT_FAILED = 1        # At least one file could not be validated or saved
+EXIT_USAGE = 2         # Bad command line (argparse's own code)
+EXIT_ROW_ERRORS = 3    # Files saved, but some lookups failed (HTTP/network/token errors)
+EXIT_INTERRUPTED = 130 # Ctrl+C; the checkpoint journal is kept for --resume
+
+CLI_PROGRESS_INTERVAL = 1.0   # Seconds between progress lines on stderr
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+def format_progress(progress):
+    """One-line progress summary, e.g. "1200/5000 rows, 85 rows/s, ETA 0:00:44, 3 failed"."""
+    total = "?" if progress.total is None else progress.total
+    line = f"{progress.done}/{total} rows, {progress.rows_per_second:.0f} rows/s"
+    eta = progress.eta
+    if eta is not None:
+        line += f", ETA {format_duration(eta)}"
+    if progress.failed:
+        line += f", {progress.failed} failed"
+    return line
+
+def stderr_progress_printer(label, stream=None, interval=CLI_PROGRESS_INTERVAL):
+    """on_update callback for RunProgress that prints at most once per `interval` seconds."""
+    stream = stream or sys.stderr
+    lock = threading.Lock()
+    last = [0.0]
+
+    def on_update(progress):
+        now = time.monotonic()
+        with lock:
+            if now - last[0] < interval:
+                return
+            last[0] = now
+        print(f"{label}: {format_progress(progress)}", file=stream, flush=True)
+
+    return on_update
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="usps-validate",
+        description="Validate address files (Excel, CSV, gzip-CSV, Parquet) against the USPS Addresses 3.0 API. "
+                    "Uses the client credentials and token stored in keyring by the GUI.",
+    )
+    parser.add_argument("paths", nargs="+", metavar="FILE", help="input files to validate")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"concurrent requests per file, 1-{MAX_WORKERS_LIMIT} (default {DEFAULT_MAX_WORKERS})")
+    parser.add_argument("--cache", metavar="PATH", default=DEFAULT_CACHE_PATH,
+                        help="SQLite result cache location (default %(default)s, only used against the "
+                             "production API)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_RATE_LIMIT, metavar="RPS",
+                        help=f"max requests per second, 0 for unlimited (default {DEFAULT_RATE_LIMIT:g})")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"tries per address for transient errors (default {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument("-f", "--output-format", choices=sorted(OUTPUT_FORMATS),
+                        help="output format (default: same as the input)")
+    parser.add_argument("--resume", action=argparse.BooleanOptionalAction, default=True,
+                        help="skip rows finished by an interrupted earlier run (default on)")
+    parser.add_argument("--journal-dir", metavar="DIR", default=DEFAULT_JOURNAL_DIR,
+                        help="checkpoint journal location (default %(default)s)")
+    parser.add_argument("--streaming", action=argparse.BooleanOptionalAction, default=None,
+                        help="read and write in chunks (default: on for CSV and Parquet)")
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE,
+                        help=f"rows per chunk when streaming (default {STREAM_CHUNK_SIZE})")
+    parser.add_argument("--api-base-url", metavar="URL",
+                        help="USPS API server, e.g. https://apis-tem.usps.com or a local usps-mock-server "
+                             "(default: $USPS_API_BASE_URL or https://apis.usps.com)")
+    parser.add_argument("--report", action=argparse.BooleanOptionalAction, default=True,
+                        help="write <name>_validated.report.json with timings and request metrics (default on)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help=f"serve Prometheus metrics at http://{DEFAULT_METRICS_HOST}:PORT/metrics while running")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    return parser
+
+def cli_main(argv=None):
+    """Entry point of the usps-validate command. Returns the process exit code."""
+    args = build_arg_parser().parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1 or args.max_attempts < 1 or args.rate_limit < 0:
+        print("usps-validate: --workers, --chunk-size and --max-attempts must be at least 1, "
+              "--rate-limit at least 0", file=sys.stderr)
+        return EXIT_USAGE
+    if args.workers > MAX_WORKERS_LIMIT:
+        print(f"usps-validate: --workers can be at most {MAX_WORKERS_LIMIT}", file=sys.stderr)
+        return EXIT_USAGE
+    if args.api_base_url:
+        set_api_base_url(args.api_base_url)
+    if args.metrics_port is not None:
+        try:
+            server = start_metrics_server(args.metrics_port)
+        except OSError as e:
+            print(f"usps-validate: could not start the metrics endpoint: {e}", file=sys.stderr)
+            return EXIT_FAILED
+        host, port = server.server_address[:2]
+        print(f"Metrics at http://{host}:{port}/metrics", file=sys.stderr)
+
+    exit_code = EXIT_OK
+    for path in args.paths:
+        label = os.path.basename(path)
+        progress = None if args.quiet else RunProgress(stderr_progress_printer(label))
+        try:
+            output_path, stats = validate_file(
+                path,
+                output_path=validated_output_path(path, args.output_format),
+                max_workers=args.workers,
+                cache_path=None if args.no_cache else args.cache,
+                rate_limit=args.rate_limit or None,
+                max_attempts=args.max_attempts,
+                streaming=args.streaming,
+                chunk_size=args.chunk_size,
+                resume=args.resume,
+                journal_dir=args.journal_dir,
+                progress=progress,
+                report=args.report,
+            )
+        except USPSValidatorError as e:
+            print(f"{label}: error: {e}", file=sys.stderr)
+            exit_code = EXIT_FAILED
+            continue
+        except KeyboardInterrupt:
+            print(f"{label}: interrupted; run again to resume", file=sys.stderr)
+            return EXIT_INTERRUPTED
+
+        summary = format_run_summary(stats).replace("\n", "; ")
+        print(f"{label}: saved {output_path} ({summary})", file=sys.stderr)
+        if stats.get("failed_rows") and exit_code == EXIT_OK:
+            exit_code = EXIT_ROW_ERRORS
+    return exit_code
 
 ########################################################################
 # GUI Setup
@@ -270,6 +3110,8 @@ def update_client_credentials(client_id_entry, client_secret_entry):
     Store client_id and client_secret in keyring. 
     (We won't get a token *immediately* in this function.)
     """
+    from tkinter import messagebox
+
     cid = client_id_entry.get().strip()
     sec = client_secret_entry.get().strip()
     if not cid or not sec:
@@ -279,7 +3121,117 @@ def update_client_credentials(client_id_entry, client_secret_entry):
     set_client_secret(sec)
     messagebox.showinfo("Success", "Client credentials stored. Now click 'Get OAuth Token'.")
 
+GUI_POLL_INTERVAL_MS = 200   # How often the window refreshes progress from the worker thread
+
+class BackgroundValidation:
+    """
+    Runs validate_file on a worker thread so the window stays responsive.
+    The Tk widgets are only touched from the main thread: _poll() reads the
+    shared RunProgress every GUI_POLL_INTERVAL_MS through root.after().
+    close() cancels a running validation and destroys the window only once
+    the partial output has been written.
+    """
+
+    def __init__(self, root, progress_bar, status_var, start_button, cancel_button):
+        self.root = root
+        self.progress_bar = progress_bar
+        self.status_var = status_var
+        self.start_button = start_button
+        self.cancel_button = cancel_button
+        self.progress = None
+        self._thread = None
+        self._result = None
+        self._error = None
+        self._close_when_done = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, file_path, **options):
+        if self.running:
+            return
+        self.progress = RunProgress()
+        self._result = None
+        self._error = None
+        self._file_name = os.path.basename(file_path)
+        self._thread = threading.Thread(target=self._work, args=(file_path, options), daemon=True)
+        self.start_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.progress_bar.config(mode="indeterminate", value=0)
+        self.progress_bar.start()
+        self.status_var.set(f"Starting {self._file_name}...")
+        self._thread.start()
+        self.root.after(GUI_POLL_INTERVAL_MS, self._poll)
+
+    def _work(self, file_path, options):
+        try:
+            self._result = validate_file(file_path, progress=self.progress, **options)
+        except USPSValidatorError as e:
+            self._error = str(e)
+        except Exception as e:
+            self._error = f"Unexpected error:\n{e!r}"
+
+    def cancel(self):
+        if self.running:
+            self.progress.cancel()
+            self.cancel_button.config(state="disabled")
+            self.status_var.set("Cancelling: finishing in-flight requests and saving partial output...")
+
+    def close(self):
+        """Destroy the window, after cancelling and saving any run in progress."""
+        if not self.running:
+            self.root.destroy()
+            return
+        # The worker is a daemon thread: destroying now would kill it before it saves
+        self._close_when_done = True
+        self.cancel()
+        self.status_var.set("Cancelling: saving partial output before closing...")
+
+    def _poll(self):
+        progress = self.progress
+        if progress.total:
+            if str(self.progress_bar.cget("mode")) != "determinate":
+                self.progress_bar.stop()
+                self.progress_bar.config(mode="determinate", maximum=progress.total)
+            self.progress_bar.config(value=min(progress.done, progress.total))
+        if not progress.cancelled and (progress.done or progress.total):
+            self.status_var.set(f"{self._file_name}: {format_progress(progress)}")
+
+        if self.running:
+            self.root.after(GUI_POLL_INTERVAL_MS, self._poll)
+        else:
+            self._finish()
+
+    def _finish(self):
+        from tkinter import messagebox
+
+        if self._close_when_done:
+            # Partial output and the journal are on disk; nothing left to show
+            self.root.destroy()
+            return
+        self.progress_bar.stop()
+        self.start_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        if self._error is not None:
+            self.status_var.set("Failed")
+            messagebox.showerror("Error", self._error)
+            return
+
+        output_path, stats = self._result
+        if self.progress.cancelled:
+            self.status_var.set("Cancelled")
+            messagebox.showinfo("Cancelled", f"Partial results saved as:\n{output_path}\n\n{format_run_summary(stats)}")
+        else:
+            self.progress_bar.config(mode="determinate", maximum=max(1, stats.get("rows", 0)),
+                                     value=stats.get("rows", 0))
+            self.status_var.set(f"Done: {format_progress(self.progress)}")
+            messagebox.showinfo("Success", f"Validated file saved as:\n{output_path}\n\n{format_run_summary(stats)}")
+
 def main():
+    import tkinter as tk
+    from tkinter import ttk
+
     root = tk.Tk()
     root.title("USPS Addresses 3.0 Validator")
 
@@ -299,17 +3251,53 @@ def main():
     tk.Button(root, text="Get OAuth Token",
               command=fetch_and_store_oauth_token).pack(pady=5)
 
-    tk.Button(root, text="Select Excel File to Validate",
-              command=select_file).pack(pady=20)
+    tk.Label(root, text="Concurrent requests:").pack(pady=2)
+    workers_var = tk.IntVar(value=DEFAULT_MAX_WORKERS)
+    tk.Spinbox(root, from_=1, to=MAX_WORKERS_LIMIT, textvariable=workers_var, width=5).pack(pady=2)
+
+    select_button = tk.Button(root, text="Select File to Validate",
+                              command=lambda: select_file(workers_var, run))
+    select_button.pack(pady=(20, 5))
+
+    # Progress of the current run (rows done, rows/s, ETA, failures)
+    progress_bar = ttk.Progressbar(root, length=400)
+    progress_bar.pack(pady=2)
+    status_var = tk.StringVar(value="Idle")
+    tk.Label(root, textvariable=status_var).pack(pady=2)
+    cancel_button = tk.Button(root, text="Cancel", state="disabled", command=lambda: run.cancel())
+    cancel_button.pack(pady=(2, 10))
 
+    run = BackgroundValidation(root, progress_bar, status_var, select_button, cancel_button)
+
+    # Unfinished rows are in the checkpoint journal; the next run resumes them
+    root.protocol("WM_DELETE_WINDOW", run.close)
     root.mainloop()
 
-def select_file():
+def select_file(workers_var=None, run=None):
+    """
+    Ask for a file and validate it: in the background through `run` (a
+    BackgroundValidation) when given, otherwise blocking via process_file.
+    """
+    import tkinter as tk
+    from tkinter import filedialog
+
     file_path = filedialog.askopenfilename(
-        filetypes=[("Excel files", "*.xlsx *.xls")]
+        filetypes=INPUT_FILETYPES
     )
     if file_path:
-        process_file(file_path)
+        max_workers = DEFAULT_MAX_WORKERS
+        if workers_var is not None:
+            try:
+                max_workers = max(1, min(MAX_WORKERS_LIMIT, int(workers_var.get())))
+            except (tk.TclError, ValueError):
+                pass
+        if run is not None:
+            run.start(file_path, max_workers=max_workers)
+        else:
+            process_file(file_path, max_workers=max_workers)
 
 if __name__ == "__main__":
+    # Arguments -> headless CLI; none -> the Tkinter window
+    if len(sys.argv) > 1:
+        sys.exit(cli_main())
     main()
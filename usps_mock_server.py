@@ -0,0 +1,456 @@
+"""
+Local stand-in for the USPS Addresses 3.0 API, for offline benchmarking and tests.
+
+Implements POST /oauth2/v3/token (client credentials) and
+GET /addresses/v3/address with response bodies shaped like the real API
+(address, additionalInfo, corrections, matches, warnings). Latency, 429/5xx
+injection, token lifetime and a per-client rate limit are configurable.
+
+Run it with `uv run usps-mock-server --port 8765` (or
+`python usps_mock_server.py`) and point the validator at it with
+`--api-base-url http://127.0.0.1:8765` or USPS_API_BASE_URL. From Python:
+
+    server = start_mock_server(latency="lognormal:40,0.5", rate_limit=20)
+    usps_address_validator.set_api_base_url(server.base_url)
+    ...
+    server.shutdown()
+
+Only the standard library is used, so the server has no extra dependencies.
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TOKEN_PATH = "/oauth2/v3/token"
+ADDRESS_PATH = "/addresses/v3/address"
+STATS_PATH = "/__stats"             # Not part of the USPS API: request counters as JSON
+
+DEFAULT_PORT = 8765
+DEFAULT_TOKEN_LIFETIME = 28799      # Seconds, as the USPS token endpoint reports
+DEFAULT_LATENCY = "lognormal:35,0.4"
+MAX_LATENCY = 30.0                  # Seconds; caps heavy-tailed distributions
+
+# Common suffixes the USPS standardizes to their Publication 28 abbreviations
+STREET_SUFFIXES = {
+    "STREET": "ST", "AVENUE": "AVE", "ROAD": "RD", "DRIVE": "DR", "BOULEVARD": "BLVD",
+    "LANE": "LN", "COURT": "CT", "PLACE": "PL", "TERRACE": "TER", "PARKWAY": "PKWY",
+    "HIGHWAY": "HWY", "CIRCLE": "CIR",
+}
+DIRECTIONALS = {"NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W"}
+
+DEFAULT_ADDRESS_WARNING = (
+    "Default address: The address you entered was found but more information is needed "
+    "(such as an apartment, suite, or box number) to match to a specific address."
+)
+
+########################################################################
+# Latency Distributions
+########################################################################
+
+def parse_latency(spec, rng=random):
+    """
+    Turn a latency spec into a function returning a delay in seconds. Times in
+    the spec are milliseconds:
+      "0" or "none"          no delay
+      "fixed:MS"             always MS
+      "uniform:LO,HI"        uniform between LO and HI
+      "normal:MEAN,SD"       normal, clipped at 0
+      "exponential:MEAN"     exponential with the given mean
+      "lognormal:MEDIAN,SIGMA"  log-normal; SIGMA is the shape (0.5 = moderate tail)
+    Samples come from `rng` (a random.Random; default the module-level one).
+    Raises ValueError for anything else.
+    """
+    spec = str(spec).strip().lower()
+    if spec in ("", "0", "none"):
+        return lambda: 0.0
+
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(value) for value in args.split(",")] if args else []
+    except ValueError as e:
+        raise ValueError(f"Bad latency spec: {spec}") from e
+
+    if kind == "fixed" and len(values) == 1:
+        sample = lambda: values[0]
+    elif kind == "uniform" and len(values) == 2:
+        sample = lambda: rng.uniform(values[0], values[1])
+    elif kind == "normal" and len(values) == 2:
+        sample = lambda: rng.gauss(values[0], values[1])
+    elif kind == "exponential" and len(values) == 1:
+        sample = lambda: rng.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+    elif kind == "lognormal" and len(values) == 2:
+        mu = math.log(max(values[0], 1e-6))
+        sample = lambda: rng.lognormvariate(mu, values[1])
+    else:
+        raise ValueError(f"Bad latency spec: {spec}")
+
+    return lambda: min(MAX_LATENCY, max(0.0, sample() / 1000.0))
+
+########################################################################
+# Server State
+########################################################################
+
+class ClientBucket:
+    """Token bucket for one client: `rate` requests/second, up to `burst` at once."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Returns (allowed, remaining, seconds until the next request is allowed)."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, int(self.tokens), 0.0
+        return False, 0, (1 - self.tokens) / self.rate
+
+class MockUSPSServer(ThreadingHTTPServer):
+    """
+    HTTP server holding the mock's configuration and state (issued tokens,
+    per-client buckets, counters). All options are keyword arguments:
+
+    latency           latency spec for /address (see parse_latency)
+    token_latency     latency spec for /token
+    error_rate_429    fraction of /address requests answered 429 (on top of the rate limit)
+    error_rate_5xx    fraction answered 500/502/503/504
+    reset_rate        fraction whose connection is dropped without a response
+    retry_after       Retry-After seconds sent with injected 429s
+    token_lifetime    expires_in of issued tokens, in seconds
+    rate_limit        per-client requests/second (None = unlimited)
+    rate_burst        per-client burst size (default: rate_limit)
+    clients           {client_id: client_secret} to accept, or None to accept any
+    seed              seed for this server's own random number generator (latency
+                      and fault rolls), for repeatable runs; the process-wide
+                      `random` module is never reseeded
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, latency=DEFAULT_LATENCY, token_latency="0", error_rate_429=0.0,
+                 error_rate_5xx=0.0, reset_rate=0.0, retry_after=1, token_lifetime=DEFAULT_TOKEN_LIFETIME,
+                 rate_limit=None, rate_burst=None, clients=None, seed=None):
+        super().__init__(address, MockUSPSHandler)
+        self.rng = random.Random(seed)
+        self.latency = parse_latency(latency, self.rng)
+        self.token_latency = parse_latency(token_latency, self.rng)
+        self.error_rate_429 = error_rate_429
+        self.error_rate_5xx = error_rate_5xx
+        self.reset_rate = reset_rate
+        self.retry_after = retry_after
+        self.token_lifetime = token_lifetime
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst or (max(1, int(rate_limit)) if rate_limit else None)
+        self.clients = clients
+
+        self.lock = threading.Lock()
+        self.tokens = {}     # access token -> (client_id, expires_at)
+        self.buckets = {}    # client_id -> ClientBucket
+        self.counters = {}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    def issue_token(self, client_id):
+        token = secrets.token_urlsafe(32)
+        with self.lock:
+            self.tokens[token] = (client_id, time.time() + self.token_lifetime)
+        return token
+
+    def token_client(self, token):
+        """client_id for a live token, or None if it is unknown or expired."""
+        with self.lock:
+            entry = self.tokens.get(token)
+            if entry is None:
+                return None
+            client_id, expires_at = entry
+            if time.time() >= expires_at:
+                del self.tokens[token]
+                return None
+            return client_id
+
+    def take_rate_slot(self, client_id):
+        if not self.rate_limit:
+            return True, None, 0.0
+        with self.lock:
+            bucket = self.buckets.get(client_id)
+            if bucket is None:
+                bucket = self.buckets[client_id] = ClientBucket(self.rate_limit, self.rate_burst)
+            return bucket.take()
+
+########################################################################
+# Response Bodies
+########################################################################
+
+def error_body(code, message, errors=None):
+    """Error JSON in the shape the USPS APIs use."""
+    body = {"apiVersion": "/addresses/v3", "error": {"code": str(code), "message": message}}
+    if errors:
+        body["error"]["errors"] = errors
+    return body
+
+def standardize_street(street):
+    words = re.sub(r"[.,]", " ", street).upper().split()
+    words = [DIRECTIONALS.get(word, word) for word in words]
+    if words and words[-1] in STREET_SUFFIXES:
+        words[-1] = STREET_SUFFIXES[words[-1]]
+    return " ".join(words)
+
+def address_response(params):
+    """
+    Build a /address body for the query params. Values are derived from a hash
+    of the input, so the same address always gets the same ZIP+4, carrier
+    route and flags.
+    """
+    street = standardize_street(params["streetAddress"])
+    secondary = params.get("secondaryAddress", "").upper().strip()
+    city = (params.get("city") or "").upper().strip()
+    state = params["state"].upper().strip()
+    digest = hashlib.sha256(f"{street}|{secondary}|{city}|{state}".encode()).digest()
+
+    zip_code = params.get("ZIPCode") or f"{int.from_bytes(digest[:2], 'big') % 90000 + 10000:05d}"
+    zip_plus4 = params.get("ZIPPlus4") or f"{int.from_bytes(digest[2:4], 'big') % 10000:04d}"
+    if not city:
+        city = "ANYTOWN"
+    needs_secondary = not secondary and digest[4] % 10 == 0
+
+    address = {
+        "streetAddress": street,
+        "streetAddressAbbreviation": street,
+        "secondaryAddress": secondary,
+        "cityAbbreviation": city[:13],
+        "city": city,
+        "state": state,
+        "ZIPCode": zip_code,
+        "ZIPPlus4": zip_plus4,
+        "urbanization": params.get("urbanization", "").upper(),
+    }
+    additional = {
+        "deliveryPoint": f"{digest[5] % 100:02d}",
+        "carrierRoute": f"C{digest[6] % 100:03d}",
+        "DPVConfirmation": "D" if needs_secondary else "Y",
+        "DPVCMRA": "N",
+        "business": "Y" if params.get("firm") or digest[7] % 5 == 0 else "N",
+        "centralDeliveryPoint": "N",
+        "vacant": "Y" if digest[8] % 50 == 0 else "N",
+    }
+    body = {
+        "firm": params.get("firm", "").upper(),
+        "address": address,
+        "additionalInfo": additional,
+        "corrections": [],
+        "matches": [{"code": "31", "text": "Single Response - exact match"}],
+        "warnings": [],
+    }
+    if needs_secondary:
+        body["corrections"].append({"code": "32", "text": "Default address: more information is needed"})
+        body["matches"] = []
+        body["warnings"].append(DEFAULT_ADDRESS_WARNING)
+    return body
+
+########################################################################
+# Request Handler
+########################################################################
+
+class MockUSPSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockUSPS/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # response waits ~40 ms for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Quiet by default; request counts are available at /__stats
+        pass
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8", "replace")
+        if url.path != TOKEN_PATH:
+            self.send_json(404, error_body(404, "Not Found"))
+            return
+
+        server.count("token_requests")
+        time.sleep(server.token_latency())
+        if "json" in (self.headers.get("Content-Type") or ""):
+            try:
+                form = json.loads(raw or "{}")
+            except ValueError:
+                form = {}
+        else:
+            form = {name: values[0] for name, values in parse_qs(raw).items()}
+
+        if form.get("grant_type") != "client_credentials":
+            self.send_json(400, {"error": "unsupported_grant_type",
+                                 "error_description": "grant_type must be client_credentials"})
+            return
+        client_id = form.get("client_id", "")
+        secret = form.get("client_secret", "")
+        if not client_id or not secret or (server.clients is not None and server.clients.get(client_id) != secret):
+            server.count("token_rejected")
+            self.send_json(401, {"error": "invalid_client", "error_description": "Client authentication failed"})
+            return
+
+        token = server.issue_token(client_id)
+        self.send_json(200, {
+            "access_token": token,
+            "token_type": "Bearer",
+            "issued_at": int(time.time() * 1000),
+            "expires_in": server.token_lifetime,
+            "status": "approved",
+            "scope": form.get("scope") or "addresses",
+            "issuer": "api.usps.com",
+            "client_id": client_id,
+            "application_name": "mock",
+        })
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        if url.path == STATS_PATH:
+            self.send_json(200, server.stats())
+            return
+        if url.path != ADDRESS_PATH:
+            self.send_json(404, error_body(404, "Not Found"))
+            return
+
+        server.count("address_requests")
+        auth = self.headers.get("Authorization", "")
+        client_id = server.token_client(auth[7:]) if auth.startswith("Bearer ") else None
+        if client_id is None:
+            server.count("status_401")
+            self.send_json(401, error_body(401, "Unauthorized: missing, invalid or expired access token"))
+            return
+
+        allowed, remaining, wait = server.take_rate_slot(client_id)
+        limit_headers = {}
+        if server.rate_limit:
+            limit_headers = {"X-RateLimit-Limit": server.rate_burst, "X-RateLimit-Remaining": remaining,
+                             "X-RateLimit-Reset": f"{wait:.3f}"}
+        if not allowed:
+            server.count("status_429")
+            self.send_json(429, error_body(429, "Too Many Requests"),
+                           {"Retry-After": max(1, math.ceil(wait)), **limit_headers})
+            return
+
+        time.sleep(server.latency())
+
+        roll = server.rng.random()
+        if roll < server.reset_rate:
+            server.count("connection_resets")
+            self.close_connection = True
+            self.connection.close()
+            return
+        roll -= server.reset_rate
+        if roll < server.error_rate_429:
+            server.count("status_429")
+            self.send_json(429, error_body(429, "Too Many Requests"), {"Retry-After": server.retry_after})
+            return
+        roll -= server.error_rate_429
+        if roll < server.error_rate_5xx:
+            status = server.rng.choice([500, 502, 503, 504])
+            server.count(f"status_{status}")
+            self.send_json(status, error_body(status, "Service temporarily unavailable"))
+            return
+
+        params = {name: values[0].strip() for name, values in parse_qs(url.query).items()}
+        missing = [name for name in ("streetAddress", "state") if not params.get(name)]
+        if not params.get("city") and not params.get("ZIPCode"):
+            missing.append("city or ZIPCode")
+        if missing:
+            server.count("status_400")
+            self.send_json(400, error_body(400, "Missing required parameters",
+                                           [{"title": f"{name} is required"} for name in missing]),
+                           limit_headers)
+            return
+
+        server.count("status_200")
+        self.send_json(200, address_response(params), limit_headers)
+
+########################################################################
+# Entry Points
+########################################################################
+
+def start_mock_server(host="127.0.0.1", port=0, **options):
+    """
+    Start a MockUSPSServer on a background thread and return it (port=0 picks a
+    free port; see server.base_url). Stop it with server.shutdown().
+    """
+    server = MockUSPSServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="usps-mock-server", daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="usps-mock-server",
+                                     description="Local stand-in for the USPS Addresses 3.0 API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", default=DEFAULT_LATENCY,
+                        help="/address latency in ms: fixed:MS, uniform:LO,HI, normal:MEAN,SD, exponential:MEAN, "
+                             "lognormal:MEDIAN,SIGMA or 0 (default %(default)s)")
+    parser.add_argument("--token-latency", default="0", help="/token latency, same format")
+    parser.add_argument("--error-rate-429", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--error-rate-5xx", type=float, default=0.0, help="fraction answered 500/502/503/504")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="fraction of connections dropped")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--token-lifetime", type=int, default=DEFAULT_TOKEN_LIFETIME,
+                        help="expires_in of issued tokens, seconds (default %(default)s)")
+    parser.add_argument("--rate-limit", type=float, help="per-client requests/second (default unlimited)")
+    parser.add_argument("--rate-burst", type=int, help="per-client burst (default: the rate limit)")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable runs")
+    args = parser.parse_args(argv)
+
+    try:
+        server = MockUSPSServer((args.host, args.port), latency=args.latency, token_latency=args.token_latency,
+                                error_rate_429=args.error_rate_429, error_rate_5xx=args.error_rate_5xx,
+                                reset_rate=args.reset_rate, retry_after=args.retry_after,
+                                token_lifetime=args.token_lifetime, rate_limit=args.rate_limit,
+                                rate_burst=args.rate_burst, seed=args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Mock USPS API listening on {server.base_url} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,17 @@
+"""
+df.usps for pandas DataFrames. Importing this module registers the accessor,
+whichever order pandas and usps_address_validator were imported in:
+
+    import pandas as pd
+    import usps_pandas
+
+    validated = df.usps.validate(concurrency=16, cache=None)
+
+usps_address_validator itself stays free of pandas at import time; it only
+registers df.usps on its own when pandas was already loaded.
+"""
+from usps_address_validator import USPSAccessor, register_accessor
+
+register_accessor()
+
+__all__ = ["USPSAccessor", "register_accessor"]